@@ -1,9 +1,9 @@
+VOCALES = frozenset("aeiouAEIOU")  # Conjunto de vocales para intersecciones
+
+
 def imprimir_vocales_por_palabra(lista_palabras):
     # Para cada palabra, imprime las vocales que contiene.
-    vocales = "aeiouAEIOU"
     for palabra in lista_palabras:
-        vocales_encontradas = []
-        for letra in palabra:
-            if letra in vocales and letra not in vocales_encontradas:
-                vocales_encontradas.append(letra)
+        # Intersección en C; se ordenan por su primera aparición en la palabra
+        vocales_encontradas = sorted(VOCALES.intersection(palabra), key=palabra.index)
         print("Palabra:", palabra, "Vocales:", ", ".join(vocales_encontradas))
@@ -1,9 +1,9 @@
 n = int(input("Cantidad de palabras: "))  # Pide cantidad de palabras a leer
-palabras = []  # Lista para almacenar palabras
+palabra_mas_larga = ""  # Palabra más larga encontrada hasta el momento
 
 for _ in range(n):
     palabra = input("Introduce una palabra: ")  # Lee palabra
-    palabras.append(palabra)  # Agrega a la lista
+    if len(palabra) > len(palabra_mas_larga):  # Se queda con la primera de mayor longitud
+        palabra_mas_larga = palabra
 
-palabra_mas_larga = max(palabras, key=len)  # Busca palabra con longitud máxima
 print("La palabra más larga es:", palabra_mas_larga)  # Imprime la palabra más larga
@@ -1,20 +1,3 @@
-def resolver_colision(asteroide_nuevo, asteroide_existente):
-    """
-    Resuelve la colisión entre dos asteroides.
-    Retorna el asteroide que sobrevive, o None si ambos se destruyen.
-    """
-    # Si el nuevo asteroide es más grande, destruye al existente.
-    # El nuevo asteroide sobrevive para seguir colisionando.
-    if abs(asteroide_nuevo) > asteroide_existente:
-        return asteroide_nuevo
-    # Si ambos son del mismo tamaño, ambos se destruyen.
-    elif abs(asteroide_nuevo) == asteroide_existente:
-        return None
-    # Si el nuevo asteroide es más pequeño, se destruye.
-    # El asteroide existente sobrevive.
-    else: # abs(asteroide_nuevo) < asteroide_existente
-        return asteroide_existente
-
 def asteroid_collision(asteroids):
     """
     Simula colisiones de asteroides de una forma más estructurada.
@@ -28,35 +11,41 @@ def asteroid_collision(asteroids):
         Una lista de enteros representando el estado final de los asteroides
         después de todas las colisiones.
     """
-    resultado = []
+    # Pila preasignada con un índice entero para el tope: nunca crece
+    # más que la entrada y evita append/pop en cada colisión.
+    resultado = [0] * len(asteroids)
+    tope = -1
     for asteroide_actual in asteroids:
-        # Mientras haya un asteroide por procesar
-        while asteroide_actual is not None:
-            # No hay colisión si el resultado está vacío, si el último asteroide
-            # va a la izquierda, o si el nuevo va a la derecha.
-            if not resultado or resultado[-1] < 0 or asteroide_actual > 0:
-                resultado.append(asteroide_actual)
-                break # Pasamos al siguiente asteroide de la lista original
+        if asteroide_actual > 0:
+            # Va a la derecha: nunca alcanza a los de la pila, se apila sin
+            # evaluar la condición de colisión.
+            tope += 1
+            resultado[tope] = asteroide_actual
+            continue
 
-            # Si llegamos aquí, hay una posible colisión:
-            # resultado[-1] > 0 (derecha) y asteroide_actual < 0 (izquierda)
-            ultimo_asteroide = resultado.pop() # Sacamos el último para ver qué pasa
-            
-            sobreviviente = resolver_colision(asteroide_actual, ultimo_asteroide)
+        # El nuevo va a la izquierda: choca mientras el último no vaya a la
+        # izquierda. Su tamaño se calcula una sola vez.
+        tamano = -asteroide_actual
+        sobrevive = True
+        while sobrevive and tope >= 0 and resultado[tope] >= 0:
+            ultimo_asteroide = resultado[tope]
+            if ultimo_asteroide < tamano:
+                # El que estaba se destruye; el nuevo sigue colisionando.
+                tope -= 1
+            elif ultimo_asteroide == tamano:
+                # Ambos son del mismo tamaño, ambos se destruyen.
+                tope -= 1
+                sobrevive = False
+            else:
+                # El nuevo es más pequeño y se destruye; el último se queda.
+                sobrevive = False
 
-            if sobreviviente is None:
-                # Ambos se destruyeron, no hacemos nada y pasamos al siguiente asteroide.
-                break
-            elif sobreviviente == ultimo_asteroide:
-                # El nuevo se destruyó, el que estaba sobrevive. Lo devolvemos a la lista.
-                resultado.append(ultimo_asteroide)
-                break
-            else: # sobreviviente == asteroide_actual
-                # El que estaba se destruyó. El nuevo sobrevive y debe seguir
-                # colisionando con los que queden en la lista de resultado.
-                asteroide_actual = sobreviviente
-                # El bucle 'while' se repetirá para comparar con el nuevo último asteroide.
+        if sobrevive:
+            tope += 1
+            resultado[tope] = asteroide_actual
 
+    # Descartar las posiciones que quedaron por encima del tope
+    del resultado[tope + 1:]
     return resultado
 
 # Ejemplos de prueba
@@ -4,6 +4,41 @@
 # CURSO: Programación
 # ==========================================
 
+# ==========================================
+# REPRESENTACIÓN DE CASILLAS
+# ==========================================
+# Internamente cada casilla es un entero 0-63: casilla = (fila - 1) * 8 + columna,
+# con columna 0-7 ('a'-'h'). Así la columna es casilla & 7 y la fila es casilla >> 3.
+
+# Letras de las columnas: el índice de cada letra es su número de columna
+_COLUMNAS = 'abcdefgh'
+
+# Índice de cada letra de columna (búsqueda exacta de una sola letra)
+_INDICE_COLUMNA = {letra: indice for indice, letra in enumerate(_COLUMNAS)}
+
+def posicion_a_casilla(columna, fila):
+    """
+    Convierte una posición del tablero a su índice entero
+    :param columna: Letra entre 'a' y 'h'
+    :param fila: Número entre 1 y 8
+    :return: Casilla entre 0 y 63
+    """
+    try:
+        indice_columna = _INDICE_COLUMNA[columna]
+    except (KeyError, TypeError):
+        raise ValueError(f"Columna inválida: {columna!r} (debe ser una letra entre 'a' y 'h')") from None
+    return (fila - 1) * 8 + indice_columna
+
+
+def casilla_a_posicion(casilla):
+    """
+    Convierte un índice entero de casilla a posición del tablero
+    :param casilla: Casilla entre 0 y 63
+    :return: Tupla (columna, fila)
+    """
+    return (_COLUMNAS[casilla & 7], (casilla >> 3) + 1)
+
+
 # ==========================================
 # CAPA DE ENTIDADES (Clases con Herencia)
 # ==========================================
@@ -14,20 +49,62 @@ class Pieza:
     Implementa herencia y polimorfismo para todas las piezas
     """
     
-    def __init__(self, nombre, posicion):
+    # Atributos fijos: sin __dict__ por instancia, acceso por desplazamiento
+    __slots__ = ('casilla', '_movimientos')
+    
+    # Nombre de la pieza: constante de cada clase, no se guarda por instancia
+    nombre = "Pieza"
+    
+    # Tabla {casilla: frozenset de destinos} compartida por todas las instancias
+    # de cada subclase; se asigna al construir las tablas precalculadas
+    _CONJUNTOS_MOVIMIENTOS = None
+    
+    def __init__(self, posicion):
         """
         Constructor de la superclase
-        :param nombre: Nombre de la pieza (ej: "Torre", "Caballo")
         :param posicion: Tupla (columna, fila) donde columna es 'a'-'h' y fila es 1-8
         """
-        self.nombre = nombre
-        self.columna = posicion[0]
-        self.fila = posicion[1]
+        columna, fila = posicion
+        if not isinstance(fila, int) or not 1 <= fila <= 8:
+            raise ValueError(f"Fila inválida: {fila!r} (debe ser un número entre 1 y 8)")
+        # Solo se guarda la casilla; columna y fila se derivan de ella
+        self.casilla = posicion_a_casilla(columna, fila)
+        # Caché de movimientos (se calcula en la primera consulta)
+        self._movimientos = None
+    
+    @property
+    def columna(self):
+        """Letra de la columna ('a'-'h'), derivada de la casilla"""
+        return _COLUMNAS[self.casilla & 7]
+    
+    @property
+    def fila(self):
+        """Número de la fila (1-8), derivado de la casilla"""
+        return (self.casilla >> 3) + 1
     
     def obtener_posicion(self):
         """Retorna la posición actual como tupla"""
         return (self.columna, self.fila)
     
+    def movimientos(self):
+        """
+        Retorna los movimientos posibles, calculándolos solo la primera vez
+        :return: Casillas (0-63) a las que puede moverse la pieza
+        """
+        if self._movimientos is None:
+            self._movimientos = self.calcular_movimientos_posibles()
+        return self._movimientos
+    
+    def puede_mover_a(self, destino):
+        """
+        Verifica si la pieza puede moverse a una casilla
+        :param destino: Casilla destino (0-63)
+        :return: True si el movimiento es posible, False si no
+        """
+        if self._CONJUNTOS_MOVIMIENTOS is None:
+            return destino in self.movimientos()
+        return destino in self._CONJUNTOS_MOVIMIENTOS[self.casilla]
+    
     def calcular_movimientos_posibles(self):
         """
         MÉTODO POLIMÓRFICO: Cada subclase implementará su propia lógica
@@ -43,6 +120,18 @@ class Pieza:
         :return: True si es válida, False si no
         """
         return 'a' <= columna <= 'h' and 1 <= fila <= 8
+    
+    @staticmethod
+    def esta_en_tablero(columna, fila):
+        """
+        Valida coordenadas enteras del tablero
+        :param columna: Índice de columna (0-7)
+        :param fila: Índice de fila (0-7)
+        :return: True si está dentro del tablero, False si no
+        """
+        # Ambos índices están en 0-7 solo si ninguno tiene bits fuera de los 3 bajos
+        # (los negativos tienen todos los bits altos encendidos)
+        return (columna | fila) & ~7 == 0
 
 
 class Torre(Pieza):
@@ -50,26 +139,34 @@ class Torre(Pieza):
     SUBCLASE: Torre - Se mueve en líneas rectas (horizontal y vertical)
     """
     
-    def __init__(self, posicion):
-        super().__init__("Torre", posicion)
+    __slots__ = ()
+    nombre = "Torre"
     
     def calcular_movimientos_posibles(self):
         """
         POLIMORFISMO: Implementación específica para Torre
+        Consulta la tabla precalculada al importar el módulo
+        """
+        return _MOVIMIENTOS_TORRE[self.casilla]
+    
+    def _generar_movimientos(self):
+        """
+        Genera los movimientos de Torre desde su posición (usado para construir la tabla)
         La torre se mueve en líneas rectas: horizontal y vertical
         """
         movimientos = []
+        columna = self.casilla & 7
+        fila = self.casilla >> 3
         
         # Movimientos verticales (misma columna, diferentes filas)
-        for fila in range(1, 9):
-            if fila != self.fila:
-                movimientos.append((self.columna, fila))
+        for nueva_fila in range(8):
+            if nueva_fila != fila:
+                movimientos.append(nueva_fila * 8 + columna)
         
         # Movimientos horizontales (misma fila, diferentes columnas)
-        for columna_ord in range(ord('a'), ord('h') + 1):
-            columna = chr(columna_ord)
-            if columna != self.columna:
-                movimientos.append((columna, self.fila))
+        for nueva_columna in range(8):
+            if nueva_columna != columna:
+                movimientos.append(fila * 8 + nueva_columna)
         
         return movimientos
 
@@ -79,45 +176,15 @@ class Alfil(Pieza):
     SUBCLASE: Alfil - Se mueve en diagonales
     """
     
-    def __init__(self, posicion):
-        super().__init__("Alfil", posicion)
+    __slots__ = ()
+    nombre = "Alfil"
     
     def calcular_movimientos_posibles(self):
         """
         POLIMORFISMO: Implementación específica para Alfil
-        El alfil se mueve en diagonales
+        El alfil se mueve en diagonales: consulta sus rayos precalculados
         """
-        movimientos = []
-        
-        # Diagonal superior derecha
-        for i in range(1, 8):
-            nueva_columna = chr(ord(self.columna) + i)
-            nueva_fila = self.fila + i
-            if self.es_posicion_valida(nueva_columna, nueva_fila):
-                movimientos.append((nueva_columna, nueva_fila))
-        
-        # Diagonal superior izquierda
-        for i in range(1, 8):
-            nueva_columna = chr(ord(self.columna) - i)
-            nueva_fila = self.fila + i
-            if self.es_posicion_valida(nueva_columna, nueva_fila):
-                movimientos.append((nueva_columna, nueva_fila))
-        
-        # Diagonal inferior derecha
-        for i in range(1, 8):
-            nueva_columna = chr(ord(self.columna) + i)
-            nueva_fila = self.fila - i
-            if self.es_posicion_valida(nueva_columna, nueva_fila):
-                movimientos.append((nueva_columna, nueva_fila))
-        
-        # Diagonal inferior izquierda
-        for i in range(1, 8):
-            nueva_columna = chr(ord(self.columna) - i)
-            nueva_fila = self.fila - i
-            if self.es_posicion_valida(nueva_columna, nueva_fila):
-                movimientos.append((nueva_columna, nueva_fila))
-        
-        return movimientos
+        return _MOVIMIENTOS_ALFIL[self.casilla]
 
 
 class Caballo(Pieza):
@@ -125,15 +192,24 @@ class Caballo(Pieza):
     SUBCLASE: Caballo - Se mueve en forma de "L"
     """
     
-    def __init__(self, posicion):
-        super().__init__("Caballo", posicion)
+    __slots__ = ()
+    nombre = "Caballo"
     
     def calcular_movimientos_posibles(self):
         """
         POLIMORFISMO: Implementación específica para Caballo
+        Consulta la tabla precalculada al importar el módulo
+        """
+        return _MOVIMIENTOS_CABALLO[self.casilla]
+    
+    def _generar_movimientos(self):
+        """
+        Genera los movimientos de Caballo desde su posición (usado para construir la tabla)
         El caballo se mueve en forma de L (2 casillas en una dirección, 1 en perpendicular)
         """
         movimientos = []
+        columna = self.casilla & 7
+        fila = self.casilla >> 3
         
         # Los 8 movimientos posibles del caballo en forma de L
         movimientos_l = [
@@ -144,11 +220,11 @@ class Caballo(Pieza):
         ]
         
         for delta_col, delta_fila in movimientos_l:
-            nueva_columna = chr(ord(self.columna) + delta_col)
-            nueva_fila = self.fila + delta_fila
+            nueva_columna = columna + delta_col
+            nueva_fila = fila + delta_fila
             
-            if self.es_posicion_valida(nueva_columna, nueva_fila):
-                movimientos.append((nueva_columna, nueva_fila))
+            if self.esta_en_tablero(nueva_columna, nueva_fila):
+                movimientos.append(nueva_fila * 8 + nueva_columna)
         
         return movimientos
 
@@ -158,53 +234,15 @@ class Reina(Pieza):
     SUBCLASE: Reina - Se mueve como Torre + Alfil (horizontal, vertical y diagonal)
     """
     
-    def __init__(self, posicion):
-        super().__init__("Reina", posicion)
+    __slots__ = ()
+    nombre = "Reina"
     
     def calcular_movimientos_posibles(self):
         """
         POLIMORFISMO: Implementación específica para Reina
-        La reina combina movimientos de Torre y Alfil
+        La reina combina movimientos de Torre y Alfil: consulta su tabla unida
         """
-        movimientos = []
-        
-        # Movimientos de Torre (horizontal y vertical)
-        for fila in range(1, 9):
-            if fila != self.fila:
-                movimientos.append((self.columna, fila))
-        
-        for columna_ord in range(ord('a'), ord('h') + 1):
-            columna = chr(columna_ord)
-            if columna != self.columna:
-                movimientos.append((columna, self.fila))
-        
-        # Movimientos de Alfil (diagonales)
-        for i in range(1, 8):
-            # Diagonal superior derecha
-            nueva_columna = chr(ord(self.columna) + i)
-            nueva_fila = self.fila + i
-            if self.es_posicion_valida(nueva_columna, nueva_fila):
-                movimientos.append((nueva_columna, nueva_fila))
-            
-            # Diagonal superior izquierda
-            nueva_columna = chr(ord(self.columna) - i)
-            nueva_fila = self.fila + i
-            if self.es_posicion_valida(nueva_columna, nueva_fila):
-                movimientos.append((nueva_columna, nueva_fila))
-            
-            # Diagonal inferior derecha
-            nueva_columna = chr(ord(self.columna) + i)
-            nueva_fila = self.fila - i
-            if self.es_posicion_valida(nueva_columna, nueva_fila):
-                movimientos.append((nueva_columna, nueva_fila))
-            
-            # Diagonal inferior izquierda
-            nueva_columna = chr(ord(self.columna) - i)
-            nueva_fila = self.fila - i
-            if self.es_posicion_valida(nueva_columna, nueva_fila):
-                movimientos.append((nueva_columna, nueva_fila))
-        
-        return movimientos
+        return _MOVIMIENTOS_REINA[self.casilla]
 
 
 class Rey(Pieza):
@@ -212,15 +250,24 @@ class Rey(Pieza):
     SUBCLASE: Rey - Se mueve una casilla en cualquier dirección
     """
     
-    def __init__(self, posicion):
-        super().__init__("Rey", posicion)
+    __slots__ = ()
+    nombre = "Rey"
     
     def calcular_movimientos_posibles(self):
         """
         POLIMORFISMO: Implementación específica para Rey
+        Consulta la tabla precalculada al importar el módulo
+        """
+        return _MOVIMIENTOS_REY[self.casilla]
+    
+    def _generar_movimientos(self):
+        """
+        Genera los movimientos de Rey desde su posición (usado para construir la tabla)
         El rey se mueve una casilla en cualquier dirección
         """
         movimientos = []
+        columna = self.casilla & 7
+        fila = self.casilla >> 3
         
         # Las 8 direcciones posibles (horizontal, vertical y diagonal)
         direcciones = [
@@ -231,11 +278,11 @@ class Rey(Pieza):
         ]
         
         for delta_col, delta_fila in direcciones:
-            nueva_columna = chr(ord(self.columna) + delta_col)
-            nueva_fila = self.fila + delta_fila
+            nueva_columna = columna + delta_col
+            nueva_fila = fila + delta_fila
             
-            if self.es_posicion_valida(nueva_columna, nueva_fila):
-                movimientos.append((nueva_columna, nueva_fila))
+            if self.esta_en_tablero(nueva_columna, nueva_fila):
+                movimientos.append(nueva_fila * 8 + nueva_columna)
         
         return movimientos
 
@@ -245,36 +292,142 @@ class Peon(Pieza):
     SUBCLASE: Peón - Se mueve hacia adelante (simplificado sin capturas diagonales)
     """
     
+    __slots__ = ('color', 'posicion_inicial')
+    nombre = "Peón"
+    
     def __init__(self, posicion, color='blanco'):
-        super().__init__("Peón", posicion)
-        self.color = color  # 'blanco' o 'negro'
+        super().__init__(posicion)
+        # Normalizar el color: cualquier valor distinto de 'blanco' se trata como negro
+        self.color = 'blanco' if str(color).strip().lower() == 'blanco' else 'negro'
         # Determinar posición inicial según color
-        self.posicion_inicial = 2 if color == 'blanco' else 7
+        self.posicion_inicial = 2 if self.color == 'blanco' else 7
     
     def calcular_movimientos_posibles(self):
         """
         POLIMORFISMO: Implementación específica para Peón
+        Consulta la tabla precalculada por color y posición
+        """
+        return _MOVIMIENTOS_PEON[(self.color, self.casilla)]
+    
+    def puede_mover_a(self, destino):
+        """
+        Verifica si el peón puede moverse a una casilla (la tabla depende del color)
+        :param destino: Casilla destino (0-63)
+        :return: True si el movimiento es posible, False si no
+        """
+        return destino in self._CONJUNTOS_MOVIMIENTOS[(self.color, self.casilla)]
+    
+    def _generar_movimientos(self):
+        """
+        Genera los movimientos del Peón desde su posición (usado para construir la tabla)
         El peón se mueve hacia adelante (1 o 2 casillas desde posición inicial)
         """
         movimientos = []
+        columna = self.casilla & 7
+        fila = self.casilla >> 3
         
         # Dirección según el color
         direccion = 1 if self.color == 'blanco' else -1
         
         # Movimiento de 1 casilla hacia adelante
-        nueva_fila = self.fila + direccion
-        if self.es_posicion_valida(self.columna, nueva_fila):
-            movimientos.append((self.columna, nueva_fila))
+        nueva_fila = fila + direccion
+        if self.esta_en_tablero(columna, nueva_fila):
+            movimientos.append(nueva_fila * 8 + columna)
         
         # Movimiento de 2 casillas si está en posición inicial
-        if self.fila == self.posicion_inicial:
-            nueva_fila = self.fila + (2 * direccion)
-            if self.es_posicion_valida(self.columna, nueva_fila):
-                movimientos.append((self.columna, nueva_fila))
+        if fila + 1 == self.posicion_inicial:
+            nueva_fila = fila + (2 * direccion)
+            if self.esta_en_tablero(columna, nueva_fila):
+                movimientos.append(nueva_fila * 8 + columna)
         
         return movimientos
 
 
+# ==========================================
+# TABLAS DE MOVIMIENTOS PRECALCULADAS
+# ==========================================
+
+def _construir_tabla(crear_pieza):
+    """
+    Precalcula los movimientos de una pieza para las 64 casillas del tablero
+    :param crear_pieza: Función que recibe una posición y retorna la pieza
+    :return: Diccionario {casilla: bytes con las casillas destino}
+    """
+    # Cada casilla destino ocupa un byte en lugar de un objeto de Python; bytes es
+    # inmutable, así que las tablas compartidas no se pueden alterar desde fuera
+    return {
+        casilla: bytes(crear_pieza(casilla_a_posicion(casilla))._generar_movimientos())
+        for casilla in range(64)
+    }
+
+
+def _construir_rayo(delta_col, delta_fila):
+    """
+    Precalcula, para cada casilla, las casillas alcanzables en una dirección
+    :param delta_col: Paso de columna (-1, 0 o 1)
+    :param delta_fila: Paso de fila (-1, 0 o 1)
+    :return: Tupla de 64 tuplas de casillas ordenadas por distancia
+    """
+    rayos = []
+    for casilla in range(64):
+        columna = casilla & 7
+        fila = casilla >> 3
+        rayo = []
+        for i in range(1, 8):
+            nueva_columna = columna + delta_col * i
+            nueva_fila = fila + delta_fila * i
+            if not Pieza.esta_en_tablero(nueva_columna, nueva_fila):
+                break  # Salir del tablero en esta dirección
+            rayo.append(nueva_fila * 8 + nueva_columna)
+        rayos.append(tuple(rayo))
+    return tuple(rayos)
+
+
+# Rayos diagonales indexados por casilla de origen
+_DIAGONAL_NE = _construir_rayo(1, 1)    # Superior derecha
+_DIAGONAL_NO = _construir_rayo(-1, 1)   # Superior izquierda
+_DIAGONAL_SE = _construir_rayo(1, -1)   # Inferior derecha
+_DIAGONAL_SO = _construir_rayo(-1, -1)  # Inferior izquierda
+
+_MOVIMIENTOS_TORRE = _construir_tabla(Torre)
+_MOVIMIENTOS_ALFIL = {
+    casilla: bytes(_DIAGONAL_NE[casilla] + _DIAGONAL_NO[casilla]
+                   + _DIAGONAL_SE[casilla] + _DIAGONAL_SO[casilla])
+    for casilla in range(64)
+}
+_MOVIMIENTOS_CABALLO = _construir_tabla(Caballo)
+# La reina se mueve como Torre + Alfil: se unen ambas tablas casilla por casilla
+_MOVIMIENTOS_REINA = {
+    casilla: _MOVIMIENTOS_TORRE[casilla] + _MOVIMIENTOS_ALFIL[casilla]
+    for casilla in range(64)
+}
+_MOVIMIENTOS_REY = _construir_tabla(Rey)
+# El peón depende también del color: 2 colores x 64 casillas = 128 entradas
+_MOVIMIENTOS_PEON = {
+    (color, casilla): movimientos
+    for color in ('blanco', 'negro')
+    for casilla, movimientos in _construir_tabla(
+        lambda posicion: Peon(posicion, color)).items()
+}
+
+
+def _construir_conjuntos(tabla):
+    """
+    Convierte una tabla de movimientos en conjuntos para verificar destinos en O(1)
+    :param tabla: Diccionario {clave: casillas destino}
+    :return: Diccionario {clave: frozenset de casillas destino}
+    """
+    return {clave: frozenset(movimientos) for clave, movimientos in tabla.items()}
+
+
+Torre._CONJUNTOS_MOVIMIENTOS = _construir_conjuntos(_MOVIMIENTOS_TORRE)
+Alfil._CONJUNTOS_MOVIMIENTOS = _construir_conjuntos(_MOVIMIENTOS_ALFIL)
+Caballo._CONJUNTOS_MOVIMIENTOS = _construir_conjuntos(_MOVIMIENTOS_CABALLO)
+Reina._CONJUNTOS_MOVIMIENTOS = _construir_conjuntos(_MOVIMIENTOS_REINA)
+Rey._CONJUNTOS_MOVIMIENTOS = _construir_conjuntos(_MOVIMIENTOS_REY)
+Peon._CONJUNTOS_MOVIMIENTOS = _construir_conjuntos(_MOVIMIENTOS_PEON)
+
+
 print("✅ CAPA DE ENTIDADES DEFINIDA")
 print("   • Superclase: Pieza")
 print("   • Subclases: Torre, Alfil, Caballo, Reina, Rey, Peón")
@@ -3,7 +3,32 @@
 # IMPORTA: herencia.py (Capa de Entidades)
 # ==========================================
 
+import re
+import sys
+
 from herencia import Torre, Alfil, Caballo, Reina, Rey, Peon
+from herencia import posicion_a_casilla, casilla_a_posicion
+
+# Nombre de cada casilla ("a1".."h8") indexado por su número (0-63)
+NOMBRES_CASILLAS = tuple(
+    f"{columna}{fila}" for columna, fila in map(casilla_a_posicion, range(64))
+)
+
+# Posición válida: una columna 'a'-'h' seguida de una fila '1'-'8'
+_POSICION_RE = re.compile(r"([a-h])([1-8])")
+
+
+def interpretar_posicion(texto):
+    """
+    Convierte un texto como "e4" en una posición del tablero, sin imprimir nada
+    (útil para leer movimientos en lote desde un archivo)
+    :param texto: Texto con la posición
+    :return: Tupla (columna, fila) o None si no es una posición válida
+    """
+    coincidencia = _POSICION_RE.fullmatch(texto.strip().lower())
+    if coincidencia is None:
+        return None
+    return (coincidencia.group(1), int(coincidencia.group(2)))
 
 # ==========================================
 # CAPA DE LÓGICA DE NEGOCIO
@@ -15,6 +40,18 @@ class ServicioAjedrez:
     Actúa como intermediario entre la interfaz y las entidades
     """
     
+    # Mapeo de nombres de piezas (y sus alias) a sus clases
+    PIEZAS_DISPONIBLES = {
+        'torre': Torre,
+        'alfil': Alfil,
+        'caballo': Caballo,
+        'reina': Reina,
+        'dama': Reina,
+        'rey': Rey,
+        'peon': Peon,
+        'peón': Peon
+    }
+    
     def crear_pieza(self, tipo_pieza, posicion, color='blanco'):
         """
         Factory method para crear instancias de piezas
@@ -23,32 +60,23 @@ class ServicioAjedrez:
         :param color: Color para el peón ('blanco' o 'negro')
         :return: Instancia de la pieza o None si el tipo no existe
         """
-        tipo_pieza = tipo_pieza.lower().strip()
+        clase_pieza = self.PIEZAS_DISPONIBLES.get(tipo_pieza.lower().strip())
         
-        if tipo_pieza == 'torre':
-            return Torre(posicion)
-        elif tipo_pieza == 'alfil':
-            return Alfil(posicion)
-        elif tipo_pieza == 'caballo':
-            return Caballo(posicion)
-        elif tipo_pieza == 'reina' or tipo_pieza == 'dama':
-            return Reina(posicion)
-        elif tipo_pieza == 'rey':
-            return Rey(posicion)
-        elif tipo_pieza == 'peon' or tipo_pieza == 'peón':
-            return Peon(posicion, color)
-        else:
+        if clase_pieza is None:
             return None
+        if clase_pieza is Peon:
+            return Peon(posicion, color)
+        return clase_pieza(posicion)
     
     def consultar_movimientos(self, pieza):
         """
         Obtiene todos los movimientos posibles de una pieza
         :param pieza: Instancia de una pieza
-        :return: Lista de tuplas (columna, fila) con movimientos posibles
+        :return: Casillas (0-63) con los movimientos posibles
         """
         if pieza is None:
             return []
-        return pieza.calcular_movimientos_posibles()
+        return pieza.movimientos()
     
     def verificar_movimiento(self, pieza, casilla_destino):
         """
@@ -60,8 +88,13 @@ class ServicioAjedrez:
         if pieza is None:
             return False
         
-        movimientos_posibles = self.consultar_movimientos(pieza)
-        return casilla_destino in movimientos_posibles
+        # Una casilla fuera del tablero nunca es un destino posible
+        columna, fila = casilla_destino
+        indice_columna = 'abcdefgh'.find(columna) if len(columna) == 1 else -1
+        if not pieza.esta_en_tablero(indice_columna, fila - 1):
+            return False
+        
+        return pieza.puede_mover_a(posicion_a_casilla(columna, fila))
 
 
 # ==========================================
@@ -113,7 +146,15 @@ class MenuAjedrez:
         print("   Formato: columna (a-h) y fila (1-8)")
         print("   Ejemplo: e4 → columna 'e', fila 4")
         
-        entrada = input("\nPosición: ").strip().lower()
+        entrada = input("\nPosición: ")
+        
+        # Caso común: la entrada ya es una posición válida
+        posicion = interpretar_posicion(entrada)
+        if posicion is not None:
+            return posicion
+        
+        # Entrada inusual: diagnosticar el error para el usuario
+        entrada = entrada.strip().lower()
         
         # Validar longitud
         if len(entrada) < 2:
@@ -152,20 +193,17 @@ class MenuAjedrez:
     def formatear_movimientos(self, movimientos):
         """
         Formatea la lista de movimientos para mostrarla de forma legible
-        :param movimientos: Lista de tuplas (columna, fila)
+        :param movimientos: Casillas (0-63) destino
         :return: String formateado
         """
         if not movimientos:
             return "   (No hay movimientos posibles)"
         
         # Agrupar en filas de 8 movimientos
-        resultado = []
-        for i in range(0, len(movimientos), 8):
-            grupo = movimientos[i:i+8]
-            linea = "   " + ", ".join([f"{col}{fila}" for col, fila in grupo])
-            resultado.append(linea)
-        
-        return "\n".join(resultado)
+        return "\n".join(
+            "   " + ", ".join([NOMBRES_CASILLAS[casilla] for casilla in movimientos[i:i+8]])
+            for i in range(0, len(movimientos), 8)
+        )
     
     def opcion_consultar_movimientos(self):
         """
@@ -198,10 +236,12 @@ class MenuAjedrez:
         # Obtener movimientos
         movimientos = self.servicio.consultar_movimientos(pieza)
         
-        # Mostrar resultados
-        print(f"\n✅ {pieza.nombre} en {posicion[0]}{posicion[1]}")
-        print(f"\n📍 Movimientos posibles ({len(movimientos)} casillas):")
-        print(self.formatear_movimientos(movimientos))
+        # Mostrar resultados en una sola escritura
+        sys.stdout.write(
+            f"\n✅ {pieza.nombre} en {posicion[0]}{posicion[1]}\n"
+            f"\n📍 Movimientos posibles ({len(movimientos)} casillas):\n"
+            f"{self.formatear_movimientos(movimientos)}\n"
+        )
     
     def opcion_verificar_movimiento(self):
         """
@@ -4,13 +4,8 @@ Descripción: Define la clase abstracta base para todos los analizadores
 """
 
 from abc import ABC, abstractmethod
-import sys
-import os
 
-# Agregar el directorio padre al path para importaciones
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-
-from src.modelos.dataset import Dataset
+from ..modelos.dataset import Dataset
 
 
 class AnalizadorBase(ABC):
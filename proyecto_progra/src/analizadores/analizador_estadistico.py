@@ -3,15 +3,13 @@ Módulo: analizador_estadistico.py
 Descripción: Implementa análisis estadísticos generales
 """
 
-import sys
-import os
+import math
 import statistics
+from collections import Counter
 
-# Agregar el directorio padre al path para importaciones
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-
-from src.analizadores.analizador_base import AnalizadorBase
-from src.modelos.dataset import Dataset
+from .analizador_base import AnalizadorBase
+from ..modelos.dataset import Dataset
+from ..utilidades.validadores import Validador
 
 
 class AnalizadorEstadistico(AnalizadorBase):
@@ -32,6 +30,8 @@ class AnalizadorEstadistico(AnalizadorBase):
             dataset: Dataset a analizar
         """
         super().__init__(dataset)
+        # Campos numéricos del último análisis (se calculan en la primera consulta)
+        self._campos_numericos_cache = None
     
     def analizar(self) -> dict:
         """
@@ -54,12 +54,14 @@ class AnalizadorEstadistico(AnalizadorBase):
             print("⚠ El dataset está vacío")
             return resultados
         
-        # Obtener todos los campos
+        # Obtener todos los campos como columnas en un solo recorrido
         campos = self._dataset.obtener_campos()
+        columnas = self._dataset.obtener_columnas(campos)
         
         # Analizar cada campo
         for campo in campos:
-            estadisticas = self._analizar_campo(campo)
+            valores = [valor for valor in columnas[campo] if valor is not None]
+            estadisticas = self._analizar_campo(campo, valores)
             if estadisticas:
                 resultados['campos'][campo] = estadisticas
         
@@ -70,28 +72,27 @@ class AnalizadorEstadistico(AnalizadorBase):
         
         return resultados
     
-    def _analizar_campo(self, nombre_campo: str) -> dict:
+    def _analizar_campo(self, nombre_campo: str, valores: list = None) -> dict:
         """
         Analiza un campo específico del dataset.
         
         Args:
             nombre_campo: Nombre del campo a analizar
+            valores: Valores no nulos del campo (None = obtenerlos del dataset)
             
         Returns:
             Diccionario con estadísticas del campo
         """
-        valores = self._dataset.obtener_valores_campo(nombre_campo)
+        if valores is None:
+            valores = self._dataset.obtener_valores_campo(nombre_campo)
         
         if not valores:
             return None
         
-        # Intentar análisis numérico
-        valores_numericos = []
-        for valor in valores:
-            try:
-                valores_numericos.append(float(valor))
-            except (ValueError, TypeError):
-                pass
+        # Intentar análisis numérico (conversión en bloque, sin try/except por fila)
+        valores_numericos = [
+            numero for numero in Validador.convertir_numeros(valores) if numero is not None
+        ]
         
         # Si hay suficientes valores numéricos, hacer análisis estadístico
         if len(valores_numericos) >= 2:
@@ -110,20 +111,36 @@ class AnalizadorEstadistico(AnalizadorBase):
         Returns:
             Diccionario con estadísticas
         """
+        # Una sola ordenación alimenta la mediana, el mínimo y el máximo
+        ordenados = sorted(valores)
+        n = len(ordenados)
+        mitad = n // 2
+        if n % 2:
+            mediana = ordenados[mitad]
+        else:
+            mediana = (ordenados[mitad - 1] + ordenados[mitad]) / 2
+        
+        # fmean trabaja en punto flotante (statistics.mean usa fracciones exactas
+        # y es mucho más lento); la diferencia es de 1 ulp como máximo
+        promedio = statistics.fmean(valores)
+        
         estadisticas = {
             'tipo': 'numérico',
-            'total_valores': len(valores),
+            'total_valores': n,
             'suma': round(sum(valores), 2),
-            'promedio': round(statistics.mean(valores), 2),
-            'mediana': round(statistics.median(valores), 2),
-            'minimo': round(min(valores), 2),
-            'maximo': round(max(valores), 2),
+            'promedio': round(promedio, 2),
+            'mediana': round(mediana, 2),
+            'minimo': round(ordenados[0], 2),
+            'maximo': round(ordenados[-1], 2),
         }
         
         # Calcular desviación estándar si hay más de 1 valor
-        if len(valores) > 1:
-            estadisticas['desviacion_estandar'] = round(statistics.stdev(valores), 2)
-            estadisticas['varianza'] = round(statistics.variance(valores), 2)
+        # (varianza muestral en dos pasadas con el promedio ya calculado y
+        # suma compensada; la desviación es su raíz)
+        if n > 1:
+            varianza = math.fsum([(valor - promedio) ** 2 for valor in valores]) / (n - 1)
+            estadisticas['desviacion_estandar'] = round(math.sqrt(varianza), 2)
+            estadisticas['varianza'] = round(varianza, 2)
         
         # Calcular moda si es posible
         try:
@@ -134,32 +151,41 @@ class AnalizadorEstadistico(AnalizadorBase):
         
         return estadisticas
     
-    def _estadisticas_categoricas(self, valores: list) -> dict:
+    def _estadisticas_categoricas(self, valores: list, top_k: int = 50) -> dict:
         """
         Calcula estadísticas para valores categóricos/texto.
         
+        La distribución guardada se limita a los top_k valores más frecuentes
+        para no duplicar en memoria columnas de alta cardinalidad.
+        
         Args:
             valores: Lista de valores
+            top_k: Máximo de valores a incluir en la distribución
             
         Returns:
             Diccionario con estadísticas
         """
-        # Contar frecuencias
-        frecuencias = {}
-        for valor in valores:
-            valor_str = str(valor)
-            frecuencias[valor_str] = frecuencias.get(valor_str, 0) + 1
+        # Contar frecuencias en una sola pasada (Counter cuenta en C)
+        frecuencias = Counter(map(str, valores))
+        
+        # Encontrar el valor más común (el primero en aparecer si hay empate)
+        if frecuencias:
+            valor_mas_comun, frecuencia = frecuencias.most_common(1)[0]
+        else:
+            valor_mas_comun, frecuencia = None, 0
         
-        # Encontrar el valor más común
-        valor_mas_comun = max(frecuencias, key=frecuencias.get) if frecuencias else None
+        if len(frecuencias) <= top_k:
+            distribucion = dict(frecuencias)
+        else:
+            distribucion = dict(frecuencias.most_common(top_k))
         
         estadisticas = {
             'tipo': 'categórico',
             'total_valores': len(valores),
-            'valores_unicos': len(set(valores)),
+            'valores_unicos': len(frecuencias),
             'valor_mas_comun': valor_mas_comun,
-            'frecuencia_mas_comun': frecuencias.get(valor_mas_comun, 0) if valor_mas_comun else 0,
-            'distribucion': frecuencias
+            'frecuencia_mas_comun': frecuencia if valor_mas_comun else 0,
+            'distribucion': distribucion
         }
         
         return estadisticas
@@ -189,9 +215,20 @@ class AnalizadorEstadistico(AnalizadorBase):
         if not self._resultados:
             self.analizar()
         
-        campos_numericos = []
-        for campo, stats in self._resultados.get('campos', {}).items():
-            if stats.get('tipo') == 'numérico':
-                campos_numericos.append(campo)
+        if self._campos_numericos_cache is None:
+            self._campos_numericos_cache = [
+                campo for campo, stats in self._resultados.get('campos', {}).items()
+                if stats.get('tipo') == 'numérico'
+            ]
         
-        return campos_numericos
+        return self._campos_numericos_cache.copy()
+    
+    def _guardar_resultados(self, resultados: dict) -> None:
+        """
+        Guarda los resultados del análisis e invalida la caché de campos numéricos.
+        
+        Args:
+            resultados: Diccionario con los resultados
+        """
+        super()._guardar_resultados(resultados)
+        self._campos_numericos_cache = None
@@ -3,15 +3,12 @@ Módulo: analizador_ventas.py
 Descripción: Implementa análisis específicos para datos de ventas
 """
 
-import sys
-import os
+import heapq
 from collections import defaultdict
 
-# Agregar el directorio padre al path para importaciones
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-
-from src.analizadores.analizador_base import AnalizadorBase
-from src.modelos.dataset import Dataset
+from .analizador_base import AnalizadorBase
+from ..modelos.dataset import Dataset
+from ..utilidades.validadores import Validador
 
 
 class AnalizadorVentas(AnalizadorBase):
@@ -59,16 +56,19 @@ class AnalizadorVentas(AnalizadorBase):
             print("⚠ El dataset está vacío")
             return resultados
         
-        # Calcular ventas totales y por categorías
-        resultados['ventas_totales'] = self._calcular_ventas_totales()
-        resultados['por_region'] = self._analizar_por_campo('region', 'total')
-        resultados['por_producto'] = self._analizar_por_campo('producto', 'total')
-        resultados['por_categoria'] = self._analizar_por_campo('categoria', 'total')
-        resultados['por_vendedor'] = self._analizar_por_campo('vendedor', 'total')
+        # Calcular ventas totales y por categorías en un solo recorrido
+        ventas_totales, agrupaciones = self._agregar_ventas(
+            ('region', 'producto', 'categoria', 'vendedor'), 'total'
+        )
+        resultados['ventas_totales'] = ventas_totales
+        resultados['por_region'] = agrupaciones['region']
+        resultados['por_producto'] = agrupaciones['producto']
+        resultados['por_categoria'] = agrupaciones['categoria']
+        resultados['por_vendedor'] = agrupaciones['vendedor']
         
-        # Obtener tops
-        resultados['top_productos'] = self._obtener_top_n('producto', 'total', 5)
-        resultados['top_vendedores'] = self._obtener_top_n('vendedor', 'total', 5)
+        # Obtener tops a partir de las agrupaciones ya calculadas
+        resultados['top_productos'] = self._obtener_top_n(resultados['por_producto'], 5)
+        resultados['top_vendedores'] = self._obtener_top_n(resultados['por_vendedor'], 5)
         
         # Guardar resultados
         self._guardar_resultados(resultados)
@@ -80,22 +80,46 @@ class AnalizadorVentas(AnalizadorBase):
         
         return resultados
     
-    def _calcular_ventas_totales(self) -> float:
+    def _agregar_ventas(self, campos_agrupacion: tuple, campo_suma: str) -> tuple:
         """
-        Calcula el total de ventas en el dataset.
+        Calcula el total de ventas y las sumas por varios campos en una sola pasada.
+        
+        Recorre columnas en lugar de registros y convierte cada valor a float
+        una sola vez, aunque se agrupe por varios campos.
         
+        Args:
+            campos_agrupacion: Campos por los que agrupar
+            campo_suma: Campo numérico a sumar
+            
         Returns:
-            Suma total de ventas
+            Tupla (total de ventas, {campo: {grupo: total}})
         """
         total = 0
-        for registro in self._dataset.obtener_registros():
-            valor_total = registro.obtener_campo('total')
-            if valor_total:
-                try:
-                    total += float(valor_total)
-                except ValueError:
-                    pass
-        return round(total, 2)
+        agrupaciones = [defaultdict(float) for _ in campos_agrupacion]
+        
+        columnas = self._dataset.obtener_columnas([campo_suma, *campos_agrupacion])
+        valores = columnas[campo_suma]
+        numeros = Validador.convertir_numeros(valores)
+        claves_por_registro = zip(*(columnas[campo] for campo in campos_agrupacion))
+        
+        for valor, numero, claves in zip(valores, numeros, claves_por_registro):
+            if not valor:
+                continue
+            if numero is None:
+                # Valor no numérico: el grupo se registra igual, con suma 0
+                numero = 0.0
+            else:
+                total += numero
+            
+            for agrupacion, clave in zip(agrupaciones, claves):
+                if clave:
+                    agrupacion[str(clave)] += numero
+        
+        # Redondear valores
+        return round(total, 2), {
+            campo: {k: round(v, 2) for k, v in agrupacion.items()}
+            for campo, agrupacion in zip(campos_agrupacion, agrupaciones)
+        }
     
     def _analizar_por_campo(self, campo_agrupacion: str, campo_suma: str) -> dict:
         """
@@ -108,40 +132,24 @@ class AnalizadorVentas(AnalizadorBase):
         Returns:
             Diccionario con totales por grupo
         """
-        agrupacion = defaultdict(float)
-        
-        for registro in self._dataset.obtener_registros():
-            clave = registro.obtener_campo(campo_agrupacion)
-            valor = registro.obtener_campo(campo_suma)
-            
-            if clave and valor:
-                try:
-                    agrupacion[str(clave)] += float(valor)
-                except ValueError:
-                    pass
-        
-        # Redondear valores
-        return {k: round(v, 2) for k, v in agrupacion.items()}
+        # Mismo recorrido por columnas que el análisis completo, con un solo campo
+        _, agrupaciones = self._agregar_ventas((campo_agrupacion,), campo_suma)
+        return agrupaciones[campo_agrupacion]
     
-    def _obtener_top_n(self, campo_agrupacion: str, campo_suma: str, n: int = 5) -> list:
+    def _obtener_top_n(self, agrupacion: dict, n: int = 5) -> list:
         """
         Obtiene los top N elementos según ventas.
         
         Args:
-            campo_agrupacion: Campo por el que agrupar
-            campo_suma: Campo numérico a sumar
+            agrupacion: Diccionario con totales por grupo
             n: Cantidad de elementos top a retornar
             
         Returns:
             Lista de tuplas (elemento, total) ordenadas por total
         """
-        agrupacion = self._analizar_por_campo(campo_agrupacion, campo_suma)
-        
-        # Ordenar por valor descendente
-        ordenados = sorted(agrupacion.items(), key=lambda x: x[1], reverse=True)
-        
-        # Retornar top N
-        return ordenados[:n]
+        # Seleccionar los N mayores sin ordenar todos los grupos
+        # (mismo resultado que sorted(..., reverse=True)[:n], empates incluidos)
+        return heapq.nlargest(n, agrupacion.items(), key=lambda x: x[1])
     
     def analizar_producto_especifico(self, nombre_producto: str) -> dict:
         """
@@ -165,25 +173,22 @@ class AnalizadorVentas(AnalizadorBase):
         total_vendido = 0
         ventas_por_region = defaultdict(float)
         
-        for registro in self._dataset.obtener_registros():
-            producto = registro.obtener_campo('producto')
-            
-            if producto and str(producto).lower() == nombre_producto.lower():
+        # El nombre buscado se normaliza una sola vez, no en cada registro
+        buscado = nombre_producto.lower()
+        columnas = self._dataset.obtener_columnas(['producto', 'total', 'region'])
+        totales = Validador.convertir_numeros(columnas['total'])
+        
+        for producto, valor, region in zip(columnas['producto'], totales, columnas['region']):
+            if producto and str(producto).lower() == buscado:
                 cantidad_ventas += 1
                 
-                # Sumar total
-                total = registro.obtener_campo('total')
-                if total:
-                    try:
-                        valor = float(total)
-                        total_vendido += valor
-                        
-                        # Acumular por región
-                        region = registro.obtener_campo('region')
-                        if region:
-                            ventas_por_region[str(region)] += valor
-                    except ValueError:
-                        pass
+                # Sumar total (los vacíos o no numéricos se ignoran)
+                if valor is not None:
+                    total_vendido += valor
+                    
+                    # Acumular por región
+                    if region:
+                        ventas_por_region[str(region)] += valor
         
         analisis['cantidad_ventas'] = cantidad_ventas
         analisis['total_vendido'] = round(total_vendido, 2)
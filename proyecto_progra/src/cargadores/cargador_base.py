@@ -5,13 +5,8 @@ Descripción: Define la clase abstracta base para todos los cargadores de datos
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-import sys
-import os
 
-# Agregar el directorio padre al path para importaciones
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-
-from src.modelos.dataset import Dataset
+from ..modelos.dataset import Dataset
 
 
 class CargadorBase(ABC):
@@ -58,6 +53,15 @@ class CargadorBase(ABC):
         """
         return self._ruta_archivo.exists() and self._ruta_archivo.is_file()
     
+    def obtener_tamano(self) -> int:
+        """
+        Obtiene el tamaño del archivo en bytes (una sola llamada a stat).
+        
+        Returns:
+            Tamaño del archivo en bytes
+        """
+        return self._ruta_archivo.stat().st_size
+    
     def obtener_ruta(self) -> Path:
         """
         Obtiene la ruta del archivo.
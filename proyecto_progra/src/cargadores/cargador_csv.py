@@ -3,16 +3,17 @@ Módulo: cargador_csv.py
 Descripción: Implementa el cargador de archivos CSV
 """
 
+import codecs
 import csv
 import sys
-import os
 
-# Agregar el directorio padre al path para importaciones
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from .cargador_base import CargadorBase
+from ..modelos.dataset import Dataset
+from ..modelos.registro import Registro
 
-from src.cargadores.cargador_base import CargadorBase
-from src.modelos.dataset import Dataset
-from src.modelos.registro import Registro
+# Archivos a partir de este tamaño se leen con un búfer de 1 MB
+# (menos llamadas a read() del sistema operativo)
+_TAMANO_BUFFER_GRANDE = 1 << 20
 
 
 class CargadorCSV(CargadorBase):
@@ -39,6 +40,8 @@ class CargadorCSV(CargadorBase):
         super().__init__(ruta_archivo)
         self._delimitador = delimitador
         self._encoding = encoding
+        # Encabezados leídos por cargar() u obtener_encabezados() (sin procesar)
+        self._encabezados_cache = None
     
     def cargar(self) -> Dataset:
         """
@@ -62,46 +65,40 @@ class CargadorCSV(CargadorBase):
         dataset = Dataset(nombre=self._ruta_archivo.stem)
         
         try:
-            # Abrir y leer el archivo CSV
-            with open(self._ruta_archivo, 'r', encoding=self._encoding, newline='') as archivo:
-                # Crear lector CSV
-                lector = csv.DictReader(archivo, delimiter=self._delimitador)
-                
-                # Verificar que hay encabezados
-                if lector.fieldnames is None:
-                    raise ValueError("El archivo CSV no tiene encabezados")
-                
-                # Leer cada fila y crear registros
-                contador = 0
-                for fila in lector:
-                    # Convertir la fila en un diccionario limpio
-                    datos = {campo: valor.strip() if valor else None 
-                            for campo, valor in fila.items()}
-                    
-                    # Crear registro y agregarlo al dataset
-                    registro = Registro(datos)
-                    dataset.agregar_registro(registro)
-                    contador += 1
-                
-                # Validar que se cargaron datos
-                if contador == 0:
-                    raise ValueError("El archivo CSV está vacío")
-                
-                print(f"✓ Se cargaron {contador} registros exitosamente")
+            # Un archivo de 0 bytes no tiene encabezados: no hace falta abrirlo
+            tamano = self.obtener_tamano()
+            if tamano == 0:
+                raise ValueError("El archivo CSV no tiene encabezados")
+            buffering = _TAMANO_BUFFER_GRANDE if tamano >= _TAMANO_BUFFER_GRANDE else -1
+            
+            # Elegir la codificación mirando el inicio del archivo, para no
+            # tener que releerlo completo si no es UTF-8
+            codificacion = self._detectar_codificacion()
+            
+            # Leer el archivo CSV completo antes de tocar el dataset
+            encabezados, registros = self._leer_registros(codificacion, buffering)
+            
+            # Verificar que hay encabezados
+            if encabezados is None:
+                raise ValueError("El archivo CSV no tiene encabezados")
+            
+            # Validar que se cargaron datos
+            if not registros:
+                raise ValueError("El archivo CSV está vacío")
+            
+            dataset.agregar_registros(registros)
+            if codificacion == 'latin-1' and codificacion != self._encoding:
+                print(f"✓ Se cargaron {len(registros)} registros (codificación latin-1)")
+            else:
+                print(f"✓ Se cargaron {len(registros)} registros exitosamente")
                 
         except UnicodeDecodeError:
-            # Intentar con otra codificación si falla UTF-8
+            # El inicio era válido pero hay bytes inválidos más adelante:
+            # intentar con otra codificación
             try:
-                with open(self._ruta_archivo, 'r', encoding='latin-1', newline='') as archivo:
-                    lector = csv.DictReader(archivo, delimiter=self._delimitador)
-                    contador = 0
-                    for fila in lector:
-                        datos = {campo: valor.strip() if valor else None 
-                                for campo, valor in fila.items()}
-                        registro = Registro(datos)
-                        dataset.agregar_registro(registro)
-                        contador += 1
-                    print(f"✓ Se cargaron {contador} registros (codificación latin-1)")
+                _, registros = self._leer_registros('latin-1', buffering)
+                dataset.agregar_registros(registros)
+                print(f"✓ Se cargaron {len(registros)} registros (codificación latin-1)")
             except Exception as e:
                 raise ValueError(f"Error al leer el archivo CSV: {str(e)}")
         
@@ -110,23 +107,104 @@ class CargadorCSV(CargadorBase):
         
         return dataset
     
+    def _detectar_codificacion(self) -> str:
+        """
+        Determina la codificación a usar a partir de los primeros 64 KB del archivo.
+        
+        Un archivo UTF-8 con BOM se lee como 'utf-8-sig' (así el BOM no queda
+        pegado al primer encabezado). Si el inicio no es válido en la
+        codificación configurada, se usa 'latin-1' directamente.
+        
+        Returns:
+            Nombre de la codificación con la que leer el archivo
+        """
+        with open(self._ruta_archivo, 'rb') as archivo:
+            inicio = archivo.read(64 * 1024)
+        
+        if inicio.startswith(codecs.BOM_UTF8) and codecs.lookup(self._encoding).name == 'utf-8':
+            return 'utf-8-sig'
+        
+        try:
+            # final=False: un carácter cortado al final del bloque no es un error
+            codecs.getincrementaldecoder(self._encoding)().decode(inicio, final=False)
+        except UnicodeDecodeError:
+            return 'latin-1'
+        return self._encoding
+    
+    def _leer_registros(self, encoding: str, buffering: int = -1) -> tuple:
+        """
+        Lee todas las filas del CSV y las convierte en registros.
+        
+        Usa csv.reader y arma cada diccionario con zip sobre los encabezados,
+        evitando el diccionario intermedio que csv.DictReader crea por fila.
+        
+        Args:
+            encoding: Codificación con la que abrir el archivo
+            buffering: Tamaño del búfer de lectura (-1 = el predeterminado)
+            
+        Returns:
+            Tupla (encabezados o None si no hay, lista de Registro)
+            
+        Raises:
+            ValueError: Si una fila tiene más columnas que encabezados
+        """
+        with open(self._ruta_archivo, 'r', encoding=encoding, newline='',
+                  buffering=buffering) as archivo:
+            lector = csv.reader(archivo, delimiter=self._delimitador)
+            
+            # Los encabezados son la primera fila no vacía (como en DictReader)
+            encabezados = next(lector, None)
+            while encabezados == []:
+                encabezados = next(lector, None)
+            if encabezados is None:
+                return None, []
+            self._encabezados_cache = encabezados
+            
+            # Internar los nombres de campo: las claves de todos los registros
+            # comparten el mismo objeto y las búsquedas con literales como
+            # 'total' se resuelven por identidad, sin comparar el texto
+            claves = [sys.intern(encabezado) for encabezado in encabezados]
+            
+            cantidad_campos = len(encabezados)
+            registros = []
+            for fila in lector:
+                if not fila:
+                    continue  # Las líneas en blanco no son registros
+                
+                if len(fila) > cantidad_campos:
+                    raise ValueError(
+                        f"La fila {lector.line_num} tiene más columnas que encabezados"
+                    )
+                
+                # Limpiar espacios; los campos vacíos o faltantes quedan en None
+                valores = [valor.strip() if valor else None for valor in fila]
+                valores.extend([None] * (cantidad_campos - len(valores)))
+                registros.append(Registro(dict(zip(claves, valores))))
+        
+        return encabezados, registros
+    
     def obtener_encabezados(self) -> list:
         """
         Obtiene solo los encabezados del archivo CSV sin cargar todos los datos.
         
+        Si el archivo ya se leyó con este cargador, reutiliza sus encabezados
+        en lugar de volver a abrirlo.
+        
         Returns:
             Lista con los nombres de las columnas
         """
-        if not self.validar_archivo_existe():
-            return []
+        if self._encabezados_cache is None:
+            if not self.validar_archivo_existe():
+                return []
+            
+            try:
+                with open(self._ruta_archivo, 'r', encoding=self._encoding, newline='') as archivo:
+                    lector = csv.reader(archivo, delimiter=self._delimitador)
+                    self._encabezados_cache = next(lector)
+            except Exception:
+                return []
         
-        try:
-            with open(self._ruta_archivo, 'r', encoding=self._encoding, newline='') as archivo:
-                lector = csv.reader(archivo, delimiter=self._delimitador)
-                encabezados = next(lector)
-                return [encabezado.strip() for encabezado in encabezados]
-        except Exception:
-            return []
+        return [encabezado.strip() for encabezado in self._encabezados_cache]
     
     def contar_filas(self) -> int:
         """
@@ -139,9 +217,52 @@ class CargadorCSV(CargadorBase):
             return 0
         
         try:
+            cantidad = self._contar_lineas_en_bytes()
+            if cantidad is not None:
+                return cantidad
+            
             with open(self._ruta_archivo, 'r', encoding=self._encoding, newline='') as archivo:
                 lector = csv.reader(archivo, delimiter=self._delimitador)
                 next(lector)  # Saltar encabezados
                 return sum(1 for _ in lector)
         except Exception:
             return 0
+    
+    def _contar_lineas_en_bytes(self):
+        """
+        Cuenta las filas de datos contando saltos de línea directamente en los bytes.
+        
+        Evita decodificar y tokenizar cada campo con csv.reader. Solo aplica
+        cuando cada línea es exactamente una fila: codificación compatible con
+        ASCII, sin comillas (que podrían contener saltos de línea) y sin
+        finales de línea '\r' sueltos.
+        
+        Returns:
+            Número de filas de datos, o None si hay que usar csv.reader
+        """
+        if codecs.lookup(self._encoding).name not in ('utf-8', 'ascii', 'iso8859-1', 'cp1252'):
+            return None
+        
+        saltos = retornos = saltos_crlf = 0
+        ultimo = b''
+        with open(self._ruta_archivo, 'rb') as archivo:
+            # Bloques de 1 MB: bytes.count recorre cada bloque en C
+            for bloque in iter(lambda: archivo.read(1 << 20), b''):
+                if b'"' in bloque:
+                    return None
+                saltos += bloque.count(b'\n')
+                retornos += bloque.count(b'\r')
+                saltos_crlf += bloque.count(b'\r\n')
+                # Un '\r\n' puede quedar partido entre dos bloques
+                if ultimo == b'\r' and bloque[:1] == b'\n':
+                    saltos_crlf += 1
+                ultimo = bloque[-1:]
+        
+        if not ultimo:
+            return 0  # Archivo vacío: sin encabezados
+        if retornos != saltos_crlf:
+            return None
+        
+        # La última línea puede no terminar en salto de línea
+        lineas = saltos + (ultimo != b'\n')
+        return lineas - 1  # Sin contar encabezados
@@ -11,20 +11,19 @@ Versión: 1.0.0
 
 import sys
 import os
+from operator import attrgetter, itemgetter
 from pathlib import Path
 
 # Agregar el directorio raíz al path para importaciones
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Importaciones de módulos del proyecto
+# (analizadores y generadores de reportes se importan en los métodos que
+# los usan, para que el arranque no pague su carga si no se necesitan)
 from src.modelos.dataset import Dataset
 from src.cargadores.cargador_csv import CargadorCSV
 from src.procesadores.limpiador import Limpiador
 from src.procesadores.transformador import Transformador
-from src.analizadores.analizador_estadistico import AnalizadorEstadistico
-from src.analizadores.analizador_ventas import AnalizadorVentas
-from src.reportes.generador_consola import GeneradorReporteConsola
-from src.reportes.generador_archivo import GeneradorReporteArchivo
 from src.utilidades.validadores import Validador
 from src.utilidades.formateadores import Formateador
 from src.persistencia.registro_operaciones import RegistroOperaciones
@@ -54,6 +53,9 @@ class AplicacionProcesadorDatos:
         self.limpiador = None
         self.transformador = None
         self.ruta_data = Path(__file__).parent.parent / "data"
+        # Resultados de análisis por clase de analizador:
+        # {clase: (dataset, versión del dataset, resultados)}
+        self._cache_analisis = {}
         # Inicializar registro de operaciones (BD local)
         self.registro_bd = RegistroOperaciones()
         
@@ -102,43 +104,53 @@ class AplicacionProcesadorDatos:
         """
         Muestra el mensaje de bienvenida.
         """
-        print(Formateador.titulo("PROCESADOR DE DATOS INTERACTIVO", 70))
-        print("Sistema modular de análisis de datos")
-        print("Desarrollado con Python Standard Library\n")
-        print("Este sistema permite:")
-        print("  • Cargar datos desde archivos CSV")
-        print("  • Limpiar y transformar datos")
-        print("  • Realizar análisis estadísticos")
-        print("  • Generar reportes en múltiples formatos")
-        print(Formateador.separador(70, "="))
+        # Se arma el texto completo y se imprime de una sola vez
+        print("\n".join([
+            Formateador.titulo("PROCESADOR DE DATOS INTERACTIVO", 70),
+            "Sistema modular de análisis de datos",
+            "Desarrollado con Python Standard Library\n",
+            "Este sistema permite:",
+            "  • Cargar datos desde archivos CSV",
+            "  • Limpiar y transformar datos",
+            "  • Realizar análisis estadísticos",
+            "  • Generar reportes en múltiples formatos",
+            Formateador.separador(70, "="),
+        ]))
     
     def _mostrar_menu_principal(self):
         """
         Muestra el menú principal de opciones.
         """
-        print("\n" + Formateador.separador(70, "="))
-        print("MENÚ PRINCIPAL".center(70))
-        print(Formateador.separador(70, "="))
+        lineas = [
+            "\n" + Formateador.separador(70, "="),
+            "MENÚ PRINCIPAL".center(70),
+            Formateador.separador(70, "="),
+        ]
         
         # Indicar si hay dataset cargado
         if self.dataset:
-            print(f"📊 Dataset actual: {self.dataset.obtener_nombre()} ({self.dataset.cantidad_registros()} registros)")
+            lineas.append(f"📊 Dataset actual: {self.dataset.obtener_nombre()} ({self.dataset.cantidad_registros()} registros)")
         else:
-            print("⚠  No hay dataset cargado")
-        
-        print(Formateador.separador(70, "-"))
-        print("1. Cargar Dataset")
-        print("2. Ver Resumen de Datos")
-        print("3. Limpiar Datos")
-        print("4. Aplicar Filtros y Transformaciones")
-        print("5. Análisis Estadístico")
-        print("6. Análisis de Ventas")
-        print("7. Generar Reportes")
-        print("8. Exportar Datos")
-        print("9. Restaurar Dataset Original")
-        print("10. Ver Historial de Operaciones")
-        print("0. Salir")
-        print(Formateador.separador(70, "="))
+            lineas.append("⚠  No hay dataset cargado")
+        
+        lineas += [
+            Formateador.separador(70, "-"),
+            "1. Cargar Dataset",
+            "2. Ver Resumen de Datos",
+            "3. Limpiar Datos",
+            "4. Aplicar Filtros y Transformaciones",
+            "5. Análisis Estadístico",
+            "6. Análisis de Ventas",
+            "7. Generar Reportes",
+            "8. Exportar Datos",
+            "9. Restaurar Dataset Original",
+            "10. Ver Historial de Operaciones",
+            "0. Salir",
+            Formateador.separador(70, "="),
+        ]
+        
+        # Un solo print para todo el menú
+        print("\n".join(lineas))
     
     def _cargar_dataset(self):
         """
@@ -146,8 +158,17 @@ class AplicacionProcesadorDatos:
         """
         print(Formateador.titulo("CARGAR DATASET", 70))
         
-        # Listar archivos CSV disponibles en /data
-        archivos_csv = list(self.ruta_data.glob("*.csv"))
+        # Listar archivos CSV disponibles en /data (os.scandir entrega nombre y
+        # tipo de cada entrada sin crear objetos Path ni hacer stat por archivo)
+        try:
+            with os.scandir(self.ruta_data) as entradas:
+                archivos_csv = sorted(
+                    (entrada for entrada in entradas
+                     if entrada.name.endswith(".csv") and entrada.is_file()),
+                    key=attrgetter("name")
+                )
+        except FileNotFoundError:
+            archivos_csv = []
         
         if not archivos_csv:
             print("⚠  No se encontraron archivos CSV en la carpeta /data")
@@ -175,13 +196,11 @@ class AplicacionProcesadorDatos:
         print(f"\n🔄 Cargando {archivo_seleccionado.name}...")
         
         try:
-            cargador = CargadorCSV(str(archivo_seleccionado))
+            cargador = CargadorCSV(archivo_seleccionado.path)
             self.dataset = cargador.cargar()
             
-            # Guardar copia del dataset original
-            # Nota: En una implementación más robusta, se haría una copia profunda
-            cargador_copia = CargadorCSV(str(archivo_seleccionado))
-            self.dataset_original = cargador_copia.cargar()
+            # Guardar copia del dataset original (en memoria, sin volver a leer el CSV)
+            self.dataset_original = self.dataset.copiar()
             
             # Inicializar procesadores
             self.limpiador = Limpiador(self.dataset)
@@ -215,23 +234,25 @@ class AplicacionProcesadorDatos:
         print(f"Total de Campos: {len(self.dataset.obtener_campos())}\n")
         
         # Mostrar campos
-        print("CAMPOS DISPONIBLES:")
-        print(Formateador.separador(70, "-"))
+        lineas = ["CAMPOS DISPONIBLES:", Formateador.separador(70, "-")]
         campos = self.dataset.obtener_campos()
         for i, campo in enumerate(campos, 1):
-            valores_unicos = len(self.dataset.obtener_valores_unicos(campo))
-            print(f"  {i}. {campo} ({valores_unicos} valores únicos)")
+            valores_unicos = self.dataset.cantidad_valores_unicos(campo)
+            lineas.append(f"  {i}. {campo} ({valores_unicos} valores únicos)")
         
         # Mostrar primeros registros
-        print(f"\nPRIMEROS 5 REGISTROS:")
-        print(Formateador.separador(70, "-"))
+        lineas.append(f"\nPRIMEROS 5 REGISTROS:")
+        lineas.append(Formateador.separador(70, "-"))
         
         for i in range(min(5, self.dataset.cantidad_registros())):
             registro = self.dataset.obtener_registro(i)
-            print(f"\nRegistro {i+1}:")
+            lineas.append(f"\nRegistro {i+1}:")
             datos = registro.obtener_todos_campos()
             for campo, valor in datos.items():
-                print(f"  • {campo}: {valor}")
+                lineas.append(f"  • {campo}: {valor}")
+        
+        # Imprimir todo el bloque de una vez en lugar de una línea por campo
+        print("\n".join(lineas))
         
         # Registrar operación en BD
         self.registro_bd.registrar_operacion(
@@ -298,10 +319,8 @@ class AplicacionProcesadorDatos:
         """
         Limpia valores nulos de campos específicos.
         """
-        print("\nCAMPOS DISPONIBLES:")
         campos = self.dataset.obtener_campos()
-        for i, campo in enumerate(campos, 1):
-            print(f"  {i}. {campo}")
+        self._mostrar_campos(campos)
         
         seleccion = input("\nIngrese números de campos separados por comas (o 'todos'): ").strip()
         
@@ -330,6 +349,8 @@ class AplicacionProcesadorDatos:
         """
         Muestra el reporte de calidad de datos.
         """
+        from src.reportes.generador_consola import GeneradorReporteConsola
+        
         reporte = self.limpiador.obtener_reporte_calidad()
         
         generador = GeneradorReporteConsola("Reporte de Calidad de Datos")
@@ -376,23 +397,10 @@ class AplicacionProcesadorDatos:
         """
         campos = self.dataset.obtener_campos()
         
-        print("\nCAMPOS DISPONIBLES:")
-        for i, campo in enumerate(campos, 1):
-            print(f"  {i}. {campo}")
-        
-        seleccion = input(f"\nSeleccione campo (1-{len(campos)}): ").strip()
-        
-        if not Validador.es_entero(seleccion):
-            print("❌ Selección inválida")
-            return
-        
-        indice = int(seleccion) - 1
-        if indice < 0 or indice >= len(campos):
-            print("❌ Número fuera de rango")
+        campo_seleccionado = self._seleccionar_campo(campos)
+        if campo_seleccionado is None:
             return
         
-        campo_seleccionado = campos[indice]
-        
         # Mostrar valores únicos
         valores_unicos = self.dataset.obtener_valores_unicos(campo_seleccionado)
         print(f"\nValores únicos en '{campo_seleccionado}':")
@@ -421,25 +429,18 @@ class AplicacionProcesadorDatos:
         """
         Filtra por rango numérico.
         """
-        campos = self.dataset.obtener_campos()
-        
-        print("\nCAMPOS DISPONIBLES:")
-        for i, campo in enumerate(campos, 1):
-            print(f"  {i}. {campo}")
+        # Solo se ofrecen campos con valores numéricos: elegir uno de texto
+        # recorrería todo el dataset para devolver un resultado vacío
+        campos = self.dataset.obtener_campos_numericos(Validador.es_numero)
         
-        seleccion = input(f"\nSeleccione campo numérico (1-{len(campos)}): ").strip()
-        
-        if not Validador.es_entero(seleccion):
-            print("❌ Selección inválida")
+        if not campos:
+            print("\n⚠  El dataset no tiene campos numéricos")
             return
         
-        indice = int(seleccion) - 1
-        if indice < 0 or indice >= len(campos):
-            print("❌ Número fuera de rango")
+        campo_seleccionado = self._seleccionar_campo(campos, "CAMPOS NUMÉRICOS DISPONIBLES", "Seleccione campo numérico")
+        if campo_seleccionado is None:
             return
         
-        campo_seleccionado = campos[indice]
-        
         minimo = input("Valor mínimo: ").strip()
         maximo = input("Valor máximo: ").strip()
         
@@ -469,23 +470,10 @@ class AplicacionProcesadorDatos:
         """
         campos = self.dataset.obtener_campos()
         
-        print("\nCAMPOS DISPONIBLES:")
-        for i, campo in enumerate(campos, 1):
-            print(f"  {i}. {campo}")
-        
-        seleccion = input(f"\nSeleccione campo (1-{len(campos)}): ").strip()
-        
-        if not Validador.es_entero(seleccion):
-            print("❌ Selección inválida")
-            return
-        
-        indice = int(seleccion) - 1
-        if indice < 0 or indice >= len(campos):
-            print("❌ Número fuera de rango")
+        campo_seleccionado = self._seleccionar_campo(campos)
+        if campo_seleccionado is None:
             return
         
-        campo_seleccionado = campos[indice]
-        
         orden = input("¿Orden descendente? (s/n): ").strip().lower()
         descendente = orden == 's'
         
@@ -504,46 +492,23 @@ class AplicacionProcesadorDatos:
         """
         campos = self.dataset.obtener_campos()
         
-        print("\nCAMPOS DISPONIBLES PARA AGRUPAR:")
-        for i, campo in enumerate(campos, 1):
-            print(f"  {i}. {campo}")
-        
-        seleccion = input(f"\nSeleccione campo (1-{len(campos)}): ").strip()
-        
-        if not Validador.es_entero(seleccion):
-            print("❌ Selección inválida")
+        campo_agrupar = self._seleccionar_campo(campos, "CAMPOS DISPONIBLES PARA AGRUPAR")
+        if campo_agrupar is None:
             return
         
-        indice = int(seleccion) - 1
-        if indice < 0 or indice >= len(campos):
-            print("❌ Número fuera de rango")
+        campo_suma = self._seleccionar_campo(campos, "CAMPOS NUMÉRICOS PARA SUMAR")
+        if campo_suma is None:
             return
         
-        campo_agrupar = campos[indice]
-        
-        print("\nCAMPOS NUMÉRICOS PARA SUMAR:")
-        for i, campo in enumerate(campos, 1):
-            print(f"  {i}. {campo}")
-        
-        seleccion2 = input(f"\nSeleccione campo (1-{len(campos)}): ").strip()
-        
-        if not Validador.es_entero(seleccion2):
-            print("❌ Selección inválida")
-            return
-        
-        indice2 = int(seleccion2) - 1
-        if indice2 < 0 or indice2 >= len(campos):
-            print("❌ Número fuera de rango")
-            return
-        
-        campo_suma = campos[indice2]
-        
         totales = self.transformador.calcular_totales_por_grupo(campo_agrupar, campo_suma)
         
-        print(f"\nTOTALES DE '{campo_suma}' POR '{campo_agrupar}':")
-        print(Formateador.separador(70, "-"))
-        for grupo, total in sorted(totales.items(), key=lambda x: x[1], reverse=True):
-            print(f"  {grupo}: {Formateador.formatear_moneda(total)}")
+        # itemgetter extrae la clave de ordenamiento en C, sin llamar a una lambda
+        ordenados = sorted(totales.items(), key=itemgetter(1), reverse=True)
+        montos = Formateador.formatear_monedas([total for _, total in ordenados])
+        
+        lineas = [f"\nTOTALES DE '{campo_suma}' POR '{campo_agrupar}':", Formateador.separador(70, "-")]
+        lineas += [f"  {grupo}: {monto}" for (grupo, _), monto in zip(ordenados, montos)]
+        print("\n".join(lineas))
     
     def _mostrar_primeros_n(self):
         """
@@ -566,13 +531,15 @@ class AplicacionProcesadorDatos:
         """
         Realiza análisis estadístico del dataset.
         """
+        from src.analizadores.analizador_estadistico import AnalizadorEstadistico
+        from src.reportes.generador_consola import GeneradorReporteConsola
+        
         if not self._validar_dataset_cargado():
             return
         
         print(Formateador.titulo("ANÁLISIS ESTADÍSTICO", 70))
         
-        analizador = AnalizadorEstadistico(self.dataset)
-        resultados = analizador.analizar()
+        resultados = self._obtener_analisis(AnalizadorEstadistico)
         
         # Registrar operación en BD
         self.registro_bd.registrar_operacion(
@@ -590,13 +557,15 @@ class AplicacionProcesadorDatos:
         """
         Realiza análisis específico de ventas.
         """
+        from src.analizadores.analizador_ventas import AnalizadorVentas
+        from src.reportes.generador_consola import GeneradorReporteConsola
+        
         if not self._validar_dataset_cargado():
             return
         
         print(Formateador.titulo("ANÁLISIS DE VENTAS", 70))
         
-        analizador = AnalizadorVentas(self.dataset)
-        resultados = analizador.analizar()
+        resultados = self._obtener_analisis(AnalizadorVentas)
         
         # Registrar operación en BD
         self.registro_bd.registrar_operacion(
@@ -614,6 +583,11 @@ class AplicacionProcesadorDatos:
         """
         Genera reportes del dataset.
         """
+        from src.analizadores.analizador_estadistico import AnalizadorEstadistico
+        from src.analizadores.analizador_ventas import AnalizadorVentas
+        from src.reportes.generador_consola import GeneradorReporteConsola
+        from src.reportes.generador_archivo import GeneradorReporteArchivo
+        
         if not self._validar_dataset_cargado():
             return
         
@@ -640,12 +614,10 @@ class AplicacionProcesadorDatos:
         
         # Preparar datos según el tipo
         if tipo == "1":
-            analizador = AnalizadorEstadistico(self.dataset)
-            datos = analizador.analizar()
+            datos = self._obtener_analisis(AnalizadorEstadistico)
             titulo = "Reporte Estadístico"
         elif tipo == "2":
-            analizador = AnalizadorVentas(self.dataset)
-            datos = analizador.analizar()
+            datos = self._obtener_analisis(AnalizadorVentas)
             titulo = "Reporte de Ventas"
         elif tipo == "3":
             # Reporte con información básica
@@ -689,6 +661,8 @@ class AplicacionProcesadorDatos:
         """
         Exporta el dataset actual a un archivo.
         """
+        from src.reportes.generador_archivo import GeneradorReporteArchivo
+        
         if not self._validar_dataset_cargado():
             return
         
@@ -705,12 +679,9 @@ class AplicacionProcesadorDatos:
             'nombre': self.dataset.obtener_nombre(),
             'total_registros': self.dataset.cantidad_registros(),
             'campos': self.dataset.obtener_campos(),
-            'registros': []
+            'registros': [registro.obtener_todos_campos() for registro in self.dataset.iterar_registros()]
         }
         
-        for registro in self.dataset.obtener_registros():
-            datos_export['registros'].append(registro.obtener_todos_campos())
-        
         # Exportar como JSON
         generador = GeneradorReporteArchivo("Dataset Exportado", "json")
         generador.establecer_datos(datos_export)
@@ -736,19 +707,76 @@ class AplicacionProcesadorDatos:
         confirmacion = input("\n⚠  ¿Está seguro de restaurar el dataset original? (s/n): ").strip().lower()
         
         if confirmacion == 's':
-            # Recargar desde archivo original
-            try:
-                archivo = self.ruta_data / f"{self.dataset_original.obtener_nombre()}.csv"
-                if archivo.exists():
-                    cargador = CargadorCSV(str(archivo))
-                    self.dataset = cargador.cargar()
-                    self.limpiador = Limpiador(self.dataset)
-                    self.transformador = Transformador(self.dataset)
-                    print("\n✅ Dataset restaurado al estado original")
-                else:
-                    print("\n❌ No se pudo encontrar el archivo original")
-            except Exception as e:
-                print(f"\n❌ Error al restaurar: {str(e)}")
+            # Copiar desde la instantánea en memoria (sin releer el archivo, que
+            # pudo haberse movido o borrado); la instantánea queda intacta para
+            # poder restaurar otra vez
+            self.dataset = self.dataset_original.copiar()
+            self.limpiador = Limpiador(self.dataset)
+            self.transformador = Transformador(self.dataset)
+            print("\n✅ Dataset restaurado al estado original")
+    
+    def _obtener_analisis(self, clase_analizador):
+        """
+        Ejecuta un analizador sobre el dataset actual, reutilizando el último
+        resultado si el dataset no cambió desde entonces.
+        
+        Args:
+            clase_analizador: Clase del analizador (AnalizadorEstadistico, AnalizadorVentas)
+            
+        Returns:
+            dict: Resultados del análisis
+        """
+        version = self.dataset.obtener_version()
+        entrada = self._cache_analisis.get(clase_analizador)
+        if entrada is not None:
+            dataset, version_cache, resultados = entrada
+            # Se compara el objeto (no su id) para no confundir datasets distintos
+            if dataset is self.dataset and version_cache == version:
+                return resultados
+        
+        resultados = clase_analizador(self.dataset).analizar()
+        self._cache_analisis[clase_analizador] = (self.dataset, version, resultados)
+        return resultados
+    
+    def _mostrar_campos(self, campos: list, titulo: str = "CAMPOS DISPONIBLES"):
+        """
+        Muestra la lista numerada de campos en un solo print.
+        
+        Args:
+            campos: Nombres de los campos
+            titulo: Encabezado de la lista
+        """
+        lineas = [f"\n{titulo}:"]
+        lineas += [f"  {i}. {campo}" for i, campo in enumerate(campos, 1)]
+        print("\n".join(lineas))
+    
+    def _seleccionar_campo(self, campos: list, titulo: str = "CAMPOS DISPONIBLES",
+                           mensaje: str = "Seleccione campo"):
+        """
+        Muestra los campos y pide al usuario que elija uno por su número.
+        
+        Args:
+            campos: Nombres de los campos
+            titulo: Encabezado de la lista
+            mensaje: Texto de la solicitud
+            
+        Returns:
+            str: Campo elegido, o None si la selección no es válida
+        """
+        self._mostrar_campos(campos, titulo)
+        
+        seleccion = input(f"\n{mensaje} (1-{len(campos)}): ").strip()
+        
+        if not Validador.es_entero(seleccion):
+            print("❌ Selección inválida")
+            return None
+        
+        indice = int(seleccion) - 1
+        if indice < 0 or indice >= len(campos):
+            print("❌ Número fuera de rango")
+            return None
+        
+        return campos[indice]
     
     def _validar_dataset_cargado(self):
         """
@@ -766,6 +794,8 @@ class AplicacionProcesadorDatos:
         """
         Muestra el historial de operaciones registradas en la BD.
         """
+        from src.reportes.generador_consola import GeneradorReporteConsola
+        
         print(Formateador.titulo("HISTORIAL DE OPERACIONES", 70))
         
         print("Opciones:\n")
@@ -779,13 +809,13 @@ class AplicacionProcesadorDatos:
         opcion = input("\nSeleccione una opción: ").strip()
         
         if opcion == "1":
-            operaciones = self.registro_bd.obtener_todas_operaciones()
-            if not operaciones:
+            total = self.registro_bd.contar_operaciones()
+            if not total:
                 print("\n⚠  No hay operaciones registradas")
             else:
-                print(f"\nTotal de operaciones: {len(operaciones)}\n")
+                print(f"\nTotal de operaciones: {total}\n")
                 print(Formateador.separador(70, "-"))
-                for i, op in enumerate(operaciones, 1):
+                for i, op in enumerate(self.registro_bd.iterar_operaciones(), 1):
                     print(f"{i}. {op}")
                     if op.resultado:
                         print(f"   Resultado: {op.resultado}")
@@ -829,6 +859,9 @@ class AplicacionProcesadorDatos:
         """
         Finaliza la aplicación.
         """
+        # Escribir las operaciones aún no guardadas antes de informar la ruta
+        self.registro_bd.guardar_pendientes()
+        
         # Mostrar estadísticas finales de la sesión
         total_ops = self.registro_bd.contar_operaciones()
         print(Formateador.titulo("¡GRACIAS POR USAR EL SISTEMA!", 70))
@@ -842,6 +875,7 @@ def main():
     """
     Función principal que inicia la aplicación.
     """
+    app = None
     try:
         app = AplicacionProcesadorDatos()
         app.ejecutar()
@@ -851,6 +885,10 @@ def main():
         print(f"\n❌ Error inesperado: {str(e)}")
         import traceback
         traceback.print_exc()
+    finally:
+        # No perder las operaciones del último lote si se sale sin el menú
+        if app is not None:
+            app.registro_bd.guardar_pendientes()
 
 
 if __name__ == "__main__":
@@ -3,7 +3,7 @@ Módulo: dataset.py
 Descripción: Define la clase Dataset que representa un conjunto de registros
 """
 
-from typing import List, Callable, Any, Dict
+from typing import List, Callable, Any, Dict, Iterator
 from .registro import Registro
 
 
@@ -28,6 +28,15 @@ class Dataset:
         """
         self._registros: List[Registro] = []
         self._nombre = nombre
+        # Datos calculados que se invalidan al modificar el dataset:
+        # nombres de campos, campos numéricos (con el verificador usado)
+        # y cantidad de valores únicos
+        self._campos_cache: List[str] = None
+        self._campos_numericos_cache: tuple = None
+        self._cache_unicos: Dict[str, int] = {}
+        # Aumenta con cada modificación; permite a otros saber si sus
+        # resultados calculados sobre el dataset siguen vigentes
+        self._version = 0
     
     def agregar_registro(self, registro: Registro) -> None:
         """
@@ -38,6 +47,7 @@ class Dataset:
         """
         if isinstance(registro, Registro):
             self._registros.append(registro)
+            self.invalidar_cache()
     
     def agregar_registros(self, registros: List[Registro]) -> None:
         """
@@ -46,8 +56,11 @@ class Dataset:
         Args:
             registros: Lista de objetos Registro
         """
-        for registro in registros:
-            self.agregar_registro(registro)
+        # Se agregan en bloque y la caché se invalida una sola vez
+        cantidad_anterior = len(self._registros)
+        self._registros.extend(registro for registro in registros if isinstance(registro, Registro))
+        if len(self._registros) != cantidad_anterior:
+            self.invalidar_cache()
     
     def obtener_registros(self) -> List[Registro]:
         """
@@ -58,6 +71,18 @@ class Dataset:
         """
         return self._registros.copy()
     
+    def iterar_registros(self) -> Iterator[Registro]:
+        """
+        Recorre los registros del dataset sin copiar la lista.
+        
+        Pensado para recorridos de solo lectura: no se deben agregar ni
+        eliminar registros del dataset mientras se recorre.
+        
+        Returns:
+            Iterador sobre los registros
+        """
+        return iter(self._registros)
+    
     def cantidad_registros(self) -> int:
         """
         Obtiene la cantidad de registros en el dataset.
@@ -96,6 +121,7 @@ class Dataset:
         Elimina todos los registros del dataset.
         """
         self._registros.clear()
+        self.invalidar_cache()
     
     def filtrar(self, condicion: Callable[[Registro], bool]) -> 'Dataset':
         """
@@ -108,9 +134,9 @@ class Dataset:
             Nuevo Dataset con los registros que cumplen la condición
         """
         dataset_filtrado = Dataset(f"{self._nombre}_filtrado")
-        for registro in self._registros:
-            if condicion(registro):
-                dataset_filtrado.agregar_registro(registro)
+        # Los registros ya son Registro: se asignan en bloque, sin pasar por
+        # agregar_registro (el dataset nuevo no tiene cachés que invalidar)
+        dataset_filtrado._registros = [registro for registro in self._registros if condicion(registro)]
         return dataset_filtrado
     
     def ordenar(self, campo: str, reverso: bool = False) -> None:
@@ -121,10 +147,15 @@ class Dataset:
             campo: Nombre del campo por el cual ordenar
             reverso: Si True, ordena de forma descendente
         """
-        self._registros.sort(
-            key=lambda r: r.obtener_campo(campo) or "",
-            reverse=reverso
-        )
+        # Extraer la columna una sola vez y ordenar los índices con un
+        # acceso en C (sin lambda ni llamada a método por comparación)
+        valores = [registro.obtener_campo(campo) or "" for registro in self._registros]
+        orden = sorted(range(len(valores)), key=valores.__getitem__, reverse=reverso)
+        self._registros = [self._registros[i] for i in orden]
+        # Los campos salen del primer registro, que puede haber cambiado;
+        # el orden también afecta resultados como la moda o los empates
+        self._campos_cache = None
+        self._version += 1
     
     def obtener_campos(self) -> List[str]:
         """
@@ -135,7 +166,33 @@ class Dataset:
         """
         if self.esta_vacio():
             return []
-        return list(self._registros[0].obtener_todos_campos().keys())
+        if self._campos_cache is None:
+            # Iterar el registro recorre sus nombres de campo sin copiar sus datos
+            self._campos_cache = list(self._registros[0])
+        # Copia: quien llama puede modificar la lista sin afectar la caché
+        return self._campos_cache.copy()
+    
+    def obtener_campos_numericos(self, es_numero: Callable[[Any], bool]) -> List[str]:
+        """
+        Obtiene los campos que contienen al menos un valor numérico.
+        
+        Los registros se recorren campo por campo solo hasta encontrar el
+        primer número, y el resultado se guarda hasta que el dataset se
+        modifica (o se pide con otro verificador).
+        
+        Args:
+            es_numero: Función que indica si un valor es numérico
+            
+        Returns:
+            Lista de nombres de campos numéricos, en el orden de obtener_campos()
+        """
+        if self._campos_numericos_cache is None or self._campos_numericos_cache[0] is not es_numero:
+            campos_numericos = [
+                campo for campo in self.obtener_campos()
+                if any(es_numero(registro.obtener_campo(campo)) for registro in self._registros)
+            ]
+            self._campos_numericos_cache = (es_numero, campos_numericos)
+        return self._campos_numericos_cache[1].copy()
     
     def obtener_valores_campo(self, nombre_campo: str) -> List[Any]:
         """
@@ -147,12 +204,29 @@ class Dataset:
         Returns:
             Lista con los valores del campo en todos los registros
         """
-        valores = []
-        for registro in self._registros:
-            valor = registro.obtener_campo(nombre_campo)
-            if valor is not None:
-                valores.append(valor)
-        return valores
+        return [
+            valor for registro in self._registros
+            if (valor := registro.obtener_campo(nombre_campo)) is not None
+        ]
+    
+    def obtener_columnas(self, nombres_campos: List[str]) -> Dict[str, List[Any]]:
+        """
+        Obtiene varios campos como columnas, recorriendo los registros una sola vez.
+        
+        Las columnas están alineadas por registro: la posición i de cada lista
+        corresponde al registro i (con None donde el campo no existe).
+        
+        Args:
+            nombres_campos: Nombres de los campos
+            
+        Returns:
+            Diccionario {campo: lista de valores}
+        """
+        filas = [registro.obtener_valores(nombres_campos) for registro in self._registros]
+        if not filas:
+            return {campo: [] for campo in nombres_campos}
+        # Transponer filas a columnas (zip trabaja en C)
+        return dict(zip(nombres_campos, map(list, zip(*filas))))
     
     def obtener_valores_unicos(self, nombre_campo: str) -> List[Any]:
         """
@@ -164,8 +238,70 @@ class Dataset:
         Returns:
             Lista de valores únicos
         """
-        valores = self.obtener_valores_campo(nombre_campo)
-        return list(set(valores))
+        # Un solo recorrido, sin la lista intermedia de obtener_valores_campo
+        return list({
+            valor for registro in self._registros
+            if (valor := registro.obtener_campo(nombre_campo)) is not None
+        })
+    
+    def cantidad_valores_unicos(self, nombre_campo: str) -> int:
+        """
+        Obtiene cuántos valores únicos tiene un campo.
+        
+        El resultado se guarda hasta que el dataset se modifica, así que
+        consultas repetidas no vuelven a recorrer los registros.
+        
+        Args:
+            nombre_campo: Nombre del campo
+            
+        Returns:
+            Número de valores únicos
+        """
+        cantidad = self._cache_unicos.get(nombre_campo)
+        if cantidad is None:
+            cantidad = len(set(self.obtener_valores_campo(nombre_campo)))
+            self._cache_unicos[nombre_campo] = cantidad
+        return cantidad
+    
+    def invalidar_cache(self) -> None:
+        """
+        Descarta los datos calculados en caché.
+        
+        Debe llamarse después de modificar campos de registros ya agregados
+        (por ejemplo con Registro.establecer_campo), ya que el dataset no
+        puede detectar esos cambios por sí mismo.
+        """
+        self._campos_cache = None
+        self._campos_numericos_cache = None
+        self._cache_unicos.clear()
+        self._version += 1
+    
+    def obtener_version(self) -> int:
+        """
+        Obtiene el número de versión del dataset.
+        
+        Cambia cada vez que se agregan, eliminan, reordenan o modifican
+        registros (siempre que se llame a invalidar_cache tras editarlos).
+        
+        Returns:
+            Número de versión actual
+        """
+        return self._version
+    
+    def copiar(self) -> 'Dataset':
+        """
+        Crea una copia independiente del dataset en memoria.
+        
+        Cada registro se copia con su propio diccionario de datos, así que
+        modificar un campo en la copia no afecta al original (los valores
+        son inmutables y se comparten).
+        
+        Returns:
+            Nuevo Dataset con el mismo nombre y copias de los registros
+        """
+        copia = Dataset(self._nombre)
+        copia._registros = [Registro(registro.obtener_todos_campos()) for registro in self._registros]
+        return copia
     
     def obtener_nombre(self) -> str:
         """
@@ -6,6 +6,26 @@ Descripción: Define la clase Registro que representa una fila individual del da
 from datetime import datetime
 from typing import Any, Dict
 
+# Valores que se consideran vacíos en un campo
+VALORES_VACIOS = frozenset((None, '', 'NULL'))
+
+
+def es_valor_vacio(valor: Any) -> bool:
+    """
+    Verifica si un valor se considera vacío (None, '' o 'NULL').
+    
+    Args:
+        valor: Valor a verificar (puede no ser hashable)
+        
+    Returns:
+        True si el valor es vacío, False en caso contrario
+    """
+    try:
+        return valor in VALORES_VACIOS
+    except TypeError:
+        # Valor no hashable (lista, diccionario...): nunca es vacío
+        return False
+
 
 class Registro:
     """
@@ -18,6 +38,9 @@ class Registro:
         datos (dict): Diccionario con los campos y valores del registro
     """
     
+    # Se crea un Registro por fila: sin __dict__ por instancia, solo el diccionario de datos
+    __slots__ = ('_datos',)
+    
     def __init__(self, datos: Dict[str, Any]):
         """
         Inicializa un nuevo registro.
@@ -39,6 +62,18 @@ class Registro:
         """
         return self._datos.get(nombre_campo)
     
+    def obtener_valores(self, nombres_campos: list) -> tuple:
+        """
+        Obtiene los valores de varios campos de una sola vez.
+        
+        Args:
+            nombres_campos: Nombres de los campos a obtener
+            
+        Returns:
+            Tupla con los valores en el mismo orden (None si el campo no existe)
+        """
+        return tuple(map(self._datos.get, nombres_campos))
+    
     def establecer_campo(self, nombre_campo: str, valor: Any) -> None:
         """
         Establece el valor de un campo.
@@ -58,6 +93,18 @@ class Registro:
         """
         return self._datos.copy()
     
+    def obtener_items(self):
+        """
+        Obtiene los pares (campo, valor) del registro sin copiar sus datos.
+        
+        Es una vista de solo lectura pensada para recorridos: refleja los
+        cambios hechos con establecer_campo.
+        
+        Returns:
+            Vista con los pares (campo, valor)
+        """
+        return self._datos.items()
+    
     def tiene_campo(self, nombre_campo: str) -> bool:
         """
         Verifica si el registro tiene un campo específico.
@@ -86,11 +133,40 @@ class Registro:
         Returns:
             Lista de nombres de campos vacíos
         """
-        campos_vacios = []
-        for campo, valor in self._datos.items():
-            if valor is None or valor == '' or valor == 'NULL':
-                campos_vacios.append(campo)
-        return campos_vacios
+        return [campo for campo, valor in self._datos.items() if es_valor_vacio(valor)]
+    
+    def __getitem__(self, nombre_campo: str) -> Any:
+        """
+        Permite acceder a un campo con registro[campo] (o con operator.itemgetter).
+        
+        Args:
+            nombre_campo: Nombre del campo a obtener
+            
+        Returns:
+            Valor del campo o None si no existe
+        """
+        return self._datos.get(nombre_campo)
+    
+    def __iter__(self):
+        """
+        Recorre los nombres de los campos del registro.
+        
+        Returns:
+            Iterador sobre los nombres de los campos
+        """
+        return iter(self._datos)
+    
+    def __contains__(self, nombre_campo: str) -> bool:
+        """
+        Permite verificar un campo con 'campo in registro'.
+        
+        Args:
+            nombre_campo: Nombre del campo a verificar
+            
+        Returns:
+            True si el campo existe, False en caso contrario
+        """
+        return nombre_campo in self._datos
     
     def __str__(self) -> str:
         """
@@ -3,10 +3,15 @@ Módulo: registro_operaciones.py
 Descripción: Clase para registrar y persistir operaciones del sistema en una base de datos local
 """
 
+import os
 import pickle
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterable, Iterator
+
+# Parámetros compartidos (de solo lectura) por las operaciones sin parámetros
+_SIN_PARAMETROS = MappingProxyType({})
 
 
 class Operacion:
@@ -21,7 +26,14 @@ class Operacion:
         resultado (str): Resultado de la operación
     """
     
-    def __init__(self, dataset: str, operacion: str, parametros: Dict[str, Any] = None, resultado: str = ""):
+    # Sin __dict__ por instancia: el historial puede tener miles de operaciones
+    __slots__ = ('timestamp', 'dataset', 'operacion', 'parametros', 'resultado', '_str')
+    
+    # Atributos que se guardan con pickle (_str es solo una caché)
+    _ATRIBUTOS = ('timestamp', 'dataset', 'operacion', 'parametros', 'resultado')
+    
+    def __init__(self, dataset: str, operacion: str, parametros: Dict[str, Any] = None, resultado: str = "",
+                 timestamp: str = None):
         """
         Inicializa una operación.
         
@@ -30,23 +42,62 @@ class Operacion:
             operacion: Tipo de operación realizada
             parametros: Diccionario con los parámetros de la operación
             resultado: Resultado o estado de la operación
+            timestamp: Fecha y hora ya formateada (por defecto: el momento actual)
         """
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         self.dataset = dataset
         self.operacion = operacion
-        self.parametros = parametros if parametros else {}
+        self.parametros = parametros if parametros else _SIN_PARAMETROS
         self.resultado = resultado
+        self._str = None
     
     def __str__(self) -> str:
         """
         Representación en string de la operación.
         
+        Se arma la primera vez que se pide y se reutiliza después (los
+        parámetros no se modifican una vez registrada la operación).
+        
         Returns:
             String describiendo la operación
         """
-        params_str = ", ".join(f"{k}={v}" for k, v in self.parametros.items()) if self.parametros else "ninguno"
-        return (f"[{self.timestamp}] Dataset: {self.dataset} | "
-                f"Operación: {self.operacion} | Parámetros: {params_str}")
+        if self._str is None:
+            params_str = ", ".join(f"{k}={v}" for k, v in self.parametros.items()) if self.parametros else "ninguno"
+            self._str = (f"[{self.timestamp}] Dataset: {self.dataset} | "
+                         f"Operación: {self.operacion} | Parámetros: {params_str}")
+        return self._str
+    
+    def __getstate__(self) -> tuple:
+        """
+        Estado que se guarda con pickle (sin la representación en caché).
+        
+        Returns:
+            Tupla (None, atributos) en el formato de pickle para __slots__
+        """
+        estado = {atributo: getattr(self, atributo) for atributo in self._ATRIBUTOS}
+        if not self.parametros:
+            # MappingProxyType no se puede serializar con pickle
+            estado['parametros'] = {}
+        return None, estado
+    
+    def __setstate__(self, estado) -> None:
+        """
+        Restaura una operación deserializada con pickle.
+        
+        Acepta el estado de las versiones anteriores de la clase (un
+        diccionario con los atributos) y el de la versión con __slots__
+        (una tupla (None, atributos)).
+        
+        Args:
+            estado: Estado guardado por pickle
+        """
+        if isinstance(estado, tuple):
+            estado = estado[1]
+        for atributo, valor in estado.items():
+            setattr(self, atributo, valor)
+        if not self.parametros:
+            self.parametros = _SIN_PARAMETROS
+        self._str = None
     
     def to_dict(self) -> dict:
         """
@@ -59,7 +110,7 @@ class Operacion:
             'timestamp': self.timestamp,
             'dataset': self.dataset,
             'operacion': self.operacion,
-            'parametros': self.parametros,
+            'parametros': self.parametros if self.parametros else {},
             'resultado': self.resultado
         }
 
@@ -71,11 +122,19 @@ class RegistroOperaciones:
     Utiliza el módulo pickle para persistir las operaciones en el archivo
     'operaciones.dat' en la carpeta raíz del proyecto.
     
+    El archivo es un registro de solo anexado: una secuencia de listas de
+    operaciones serializadas una tras otra. Las operaciones nuevas se
+    agregan al final por lotes (cada TAMANO_LOTE operaciones) y al llamar
+    a guardar_pendientes(), sin volver a serializar las anteriores.
+    
     Atributos:
         ruta_bd (Path): Ruta al archivo de base de datos
         operaciones (list): Lista de operaciones registradas
     """
     
+    # Operaciones sin guardar que disparan una escritura a disco
+    TAMANO_LOTE = 32
+    
     def __init__(self, ruta_bd: str = None):
         """
         Inicializa el registro de operaciones.
@@ -90,37 +149,89 @@ class RegistroOperaciones:
         else:
             self.ruta_bd = Path(ruta_bd)
         
+        # Si el archivo no se puede leer completo, la próxima escritura lo
+        # reescribe en lugar de anexar detrás de datos dañados
+        self._reescribir_completo = False
+        
         # Cargar operaciones existentes
         self.operaciones: List[Operacion] = self._cargar_operaciones()
+        # Operaciones registradas que aún no se escribieron a disco
+        self._pendientes = 0
+        
+        # Índices {dataset: operaciones} y {tipo: operaciones} que se mantienen
+        # al registrar, para que las consultas filtradas y las estadísticas
+        # no tengan que recorrer todo el historial
+        self._por_dataset: Dict[str, List[Operacion]] = {}
+        self._por_tipo: Dict[str, List[Operacion]] = {}
+        for op in self.operaciones:
+            self._indexar(op)
     
     def _cargar_operaciones(self) -> List[Operacion]:
         """
         Carga las operaciones desde el archivo.
         
+        Lee una tras otra las listas anexadas hasta el final del archivo
+        (un archivo del formato anterior es una sola lista).
+        
         Returns:
             Lista de operaciones cargadas
         """
         if not self.ruta_bd.exists():
             return []
         
+        operaciones = []
         try:
             with open(self.ruta_bd, 'rb') as archivo:
-                operaciones = pickle.load(archivo)
-                return operaciones
+                while True:
+                    try:
+                        lote = pickle.load(archivo)
+                    except EOFError:
+                        break
+                    operaciones.extend(lote)
         except (pickle.PickleError, EOFError, FileNotFoundError):
-            # Si hay error al cargar, retornar lista vacía
-            return []
+            # Datos dañados: conservar lo leído hasta ese punto
+            self._reescribir_completo = True
+        return operaciones
     
     def _guardar_operaciones(self) -> bool:
         """
-        Guarda las operaciones en el archivo.
+        Agrega al final del archivo las operaciones pendientes.
+        
+        Returns:
+            True si se guardó exitosamente, False en caso contrario
+        """
+        if self._reescribir_completo:
+            return self._guardar_completo()
+        
+        try:
+            nuevas = self.operaciones[len(self.operaciones) - self._pendientes:]
+            with open(self.ruta_bd, 'ab') as archivo:
+                pickle.dump(nuevas, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+            self._pendientes = 0
+            return True
+        except Exception as e:
+            print(f"❌ Error al guardar operaciones: {str(e)}")
+            return False
+    
+    def _guardar_completo(self) -> bool:
+        """
+        Reescribe el archivo con todas las operaciones en memoria.
+        
+        Se escribe primero un archivo temporal que luego reemplaza al original,
+        de modo que una falla a mitad de la escritura no deja el historial dañado.
         
         Returns:
             True si se guardó exitosamente, False en caso contrario
         """
+        ruta_temporal = self.ruta_bd.with_name(self.ruta_bd.name + ".tmp")
         try:
-            with open(self.ruta_bd, 'wb') as archivo:
-                pickle.dump(self.operaciones, archivo)
+            with open(ruta_temporal, 'wb') as archivo:
+                pickle.dump(self.operaciones, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(ruta_temporal, self.ruta_bd)
+            self._pendientes = 0
+            self._reescribir_completo = False
             return True
         except Exception as e:
             print(f"❌ Error al guardar operaciones: {str(e)}")
@@ -140,15 +251,76 @@ class RegistroOperaciones:
         """
         # Crear nueva operación
         nueva_operacion = Operacion(dataset, operacion, parametros, resultado)
+        self._agregar_operacion(nueva_operacion)
+        
+        # Guardar en disco solo al completar un lote
+        if self._pendientes >= self.TAMANO_LOTE:
+            self._guardar_operaciones()
+    
+    def registrar_lote(self, operaciones: Iterable[Dict[str, Any]]) -> int:
+        """
+        Registra varias operaciones con una misma marca de tiempo.
         
-        # Agregar a la lista
-        self.operaciones.append(nueva_operacion)
+        La fecha y hora se obtiene y formatea una sola vez para todo el lote.
         
-        # Guardar en disco
-        if self._guardar_operaciones():
-            # Mensaje opcional para debug (comentado en producción)
-            # print(f"✓ Operación registrada en BD: {operacion}")
-            pass
+        Args:
+            operaciones: Diccionarios con los argumentos de registrar_operacion
+                         (dataset, operacion y opcionalmente parametros y resultado)
+            
+        Returns:
+            Número de operaciones registradas
+        """
+        marca_tiempo = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        cantidad = 0
+        
+        for datos in operaciones:
+            self._agregar_operacion(Operacion(
+                datos['dataset'],
+                datos['operacion'],
+                datos.get('parametros'),
+                datos.get('resultado', "Exitoso"),
+                timestamp=marca_tiempo
+            ))
+            cantidad += 1
+        
+        if self._pendientes >= self.TAMANO_LOTE:
+            self._guardar_operaciones()
+        
+        return cantidad
+    
+    def _agregar_operacion(self, operacion: Operacion) -> None:
+        """
+        Agrega una operación al historial y actualiza los agregados.
+        
+        Args:
+            operacion: Operación a agregar
+        """
+        self.operaciones.append(operacion)
+        self._pendientes += 1
+        self._indexar(operacion)
+    
+    def _indexar(self, operacion: Operacion) -> None:
+        """
+        Agrega una operación a los índices por dataset y por tipo.
+        
+        Args:
+            operacion: Operación a indexar
+        """
+        self._por_dataset.setdefault(operacion.dataset, []).append(operacion)
+        self._por_tipo.setdefault(operacion.operacion, []).append(operacion)
+    
+    def guardar_pendientes(self) -> bool:
+        """
+        Escribe a disco las operaciones registradas que aún no se guardaron.
+        
+        Debe llamarse antes de terminar el programa.
+        
+        Returns:
+            True si no había pendientes o se guardaron exitosamente
+        """
+        if self._pendientes == 0:
+            return True
+        return self._guardar_operaciones()
     
     def obtener_todas_operaciones(self) -> List[Operacion]:
         """
@@ -159,6 +331,17 @@ class RegistroOperaciones:
         """
         return self.operaciones.copy()
     
+    def iterar_operaciones(self) -> Iterator[Operacion]:
+        """
+        Recorre las operaciones registradas sin copiar la lista.
+        
+        No se deben registrar operaciones mientras se recorre.
+        
+        Returns:
+            Iterador sobre las operaciones, de la más antigua a la más reciente
+        """
+        return iter(self.operaciones)
+    
     def obtener_operaciones_por_dataset(self, nombre_dataset: str) -> List[Operacion]:
         """
         Obtiene operaciones filtradas por dataset.
@@ -169,7 +352,7 @@ class RegistroOperaciones:
         Returns:
             Lista de operaciones del dataset especificado
         """
-        return [op for op in self.operaciones if op.dataset == nombre_dataset]
+        return list(self._por_dataset.get(nombre_dataset, ()))
     
     def obtener_operaciones_por_tipo(self, tipo_operacion: str) -> List[Operacion]:
         """
@@ -181,7 +364,7 @@ class RegistroOperaciones:
         Returns:
             Lista de operaciones del tipo especificado
         """
-        return [op for op in self.operaciones if op.operacion == tipo_operacion]
+        return list(self._por_tipo.get(tipo_operacion, ()))
     
     def obtener_ultimas_n_operaciones(self, n: int = 10) -> List[Operacion]:
         """
@@ -193,7 +376,9 @@ class RegistroOperaciones:
         Returns:
             Lista con las últimas N operaciones
         """
-        return self.operaciones[-n:] if len(self.operaciones) >= n else self.operaciones
+        # El corte solo copia las últimas n referencias, sin importar el tamaño
+        # del historial (y nunca expone la lista interna)
+        return self.operaciones[-n:]
     
     def contar_operaciones(self) -> int:
         """
@@ -220,20 +405,13 @@ class RegistroOperaciones:
                 'ultima_operacion': None
             }
         
-        # Contar operaciones por tipo
-        tipos = {}
-        datasets = set()
-        
-        for op in self.operaciones:
-            tipos[op.operacion] = tipos.get(op.operacion, 0) + 1
-            datasets.add(op.dataset)
-        
+        # Salen de los índices (datasets y tipos en orden de primera aparición)
         return {
             'total_operaciones': len(self.operaciones),
-            'datasets_usados': list(datasets),
-            'tipos_operaciones': tipos,
-            'primera_operacion': self.operaciones[0].timestamp if self.operaciones else None,
-            'ultima_operacion': self.operaciones[-1].timestamp if self.operaciones else None
+            'datasets_usados': list(self._por_dataset),
+            'tipos_operaciones': {tipo: len(ops) for tipo, ops in self._por_tipo.items()},
+            'primera_operacion': self.operaciones[0].timestamp,
+            'ultima_operacion': self.operaciones[-1].timestamp
         }
     
     def limpiar_historial(self) -> bool:
@@ -244,7 +422,9 @@ class RegistroOperaciones:
             True si se limpió exitosamente
         """
         self.operaciones.clear()
-        return self._guardar_operaciones()
+        self._por_dataset.clear()
+        self._por_tipo.clear()
+        return self._guardar_completo()
     
     def exportar_historial_texto(self, ruta_salida: str = None) -> str:
         """
@@ -265,21 +445,22 @@ class RegistroOperaciones:
         # Crear directorio si no existe
         ruta_salida.parent.mkdir(parents=True, exist_ok=True)
         
+        # Armar el contenido completo y escribirlo de una sola vez
+        partes = ["="*70 + "\n", "HISTORIAL DE OPERACIONES\n", "="*70 + "\n\n"]
+        
+        if not self.operaciones:
+            partes.append("No hay operaciones registradas.\n")
+        else:
+            for i, op in enumerate(self.operaciones, 1):
+                partes.append(f"\n{i}. {op}\n")
+                if op.resultado:
+                    partes.append(f"   Resultado: {op.resultado}\n")
+        
+        partes.append("\n" + "="*70 + "\n")
+        partes.append(f"Total de operaciones: {len(self.operaciones)}\n")
+        
         with open(ruta_salida, 'w', encoding='utf-8') as archivo:
-            archivo.write("="*70 + "\n")
-            archivo.write("HISTORIAL DE OPERACIONES\n")
-            archivo.write("="*70 + "\n\n")
-            
-            if not self.operaciones:
-                archivo.write("No hay operaciones registradas.\n")
-            else:
-                for i, op in enumerate(self.operaciones, 1):
-                    archivo.write(f"\n{i}. {op}\n")
-                    if op.resultado:
-                        archivo.write(f"   Resultado: {op.resultado}\n")
-            
-            archivo.write("\n" + "="*70 + "\n")
-            archivo.write(f"Total de operaciones: {len(self.operaciones)}\n")
+            archivo.write(''.join(partes))
         
         return str(ruta_salida)
     
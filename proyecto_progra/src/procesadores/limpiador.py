@@ -3,14 +3,10 @@ Módulo: limpiador.py
 Descripción: Clase para limpiar y validar datos del dataset
 """
 
-import sys
-import os
+from collections import Counter
 
-# Agregar el directorio padre al path para importaciones
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-
-from src.modelos.dataset import Dataset
-from src.modelos.registro import Registro
+from ..modelos.dataset import Dataset
+from ..modelos.registro import Registro, es_valor_vacio
 
 
 class Limpiador:
@@ -41,19 +37,17 @@ class Limpiador:
             Número de duplicados eliminados
         """
         registros_unicos = []
+        vistos = set()
         duplicados = 0
         
-        for registro in self._dataset.obtener_registros():
-            if registro not in registros_unicos:
-                registros_unicos.append(registro)
-            else:
+        for registro in self._dataset.iterar_registros():
+            if self._es_duplicado(registro, vistos, registros_unicos):
                 duplicados += 1
         
-        # Limpiar y volver a llenar el dataset
-        self._dataset.limpiar()
-        self._dataset.agregar_registros(registros_unicos)
-        
+        # Limpiar y volver a llenar el dataset (sin duplicados no hay cambios)
         if duplicados > 0:
+            self._dataset.limpiar()
+            self._dataset.agregar_registros(registros_unicos)
             print(f"✓ Se eliminaron {duplicados} registros duplicados")
         
         return duplicados
@@ -68,21 +62,11 @@ class Limpiador:
         registros_validos = []
         eliminados = 0
         
-        for registro in self._dataset.obtener_registros():
-            if registro.es_valido():
-                # Verificar que al menos un campo no esté vacío
-                tiene_datos = False
-                for campo, valor in registro.obtener_todos_campos().items():
-                    if valor is not None and valor != '' and valor != 'NULL':
-                        tiene_datos = True
-                        break
-                
-                if tiene_datos:
-                    registros_validos.append(registro)
-                else:
-                    eliminados += 1
-            else:
+        for registro in self._dataset.iterar_registros():
+            if self._es_vacio(registro):
                 eliminados += 1
+            else:
+                registros_validos.append(registro)
         
         # Actualizar dataset
         self._dataset.limpiar()
@@ -93,6 +77,57 @@ class Limpiador:
         
         return eliminados
     
+    @staticmethod
+    def _es_duplicado(registro: Registro, vistos: set, registros_unicos: list) -> bool:
+        """
+        Indica si un registro repite a otro ya visto y, si no, lo marca como visto.
+        
+        Args:
+            registro: Registro a verificar
+            vistos: Claves de los registros únicos vistos hasta ahora
+            registros_unicos: Registros únicos vistos hasta ahora (se agrega
+                              el registro si no es duplicado)
+            
+        Returns:
+            True si el registro es duplicado
+        """
+        # Clave hashable equivalente a comparar los diccionarios con ==
+        # (mismos pares campo-valor, sin importar el orden)
+        try:
+            clave = frozenset(registro.obtener_items())
+        except TypeError:
+            clave = None
+        
+        if clave is None:
+            # Algún valor no es hashable: comparación directa
+            es_duplicado = registro in registros_unicos
+        else:
+            es_duplicado = clave in vistos
+            vistos.add(clave)
+        
+        if not es_duplicado:
+            registros_unicos.append(registro)
+        return es_duplicado
+    
+    @staticmethod
+    def _es_vacio(registro: Registro) -> bool:
+        """
+        Indica si un registro no tiene ningún dato válido.
+        
+        Args:
+            registro: Registro a verificar
+            
+        Returns:
+            True si el registro no es válido o todos sus campos están vacíos
+        """
+        if not registro.es_valido():
+            return True
+        # Verificar que al menos un campo no esté vacío
+        for _, valor in registro.obtener_items():
+            if not es_valor_vacio(valor):
+                return False
+        return True
+    
     def limpiar_valores_nulos(self, campos: list = None, valor_reemplazo: str = "0") -> int:
         """
         Reemplaza valores nulos/vacíos con un valor por defecto.
@@ -106,20 +141,21 @@ class Limpiador:
         """
         reemplazos = 0
         
-        for registro in self._dataset.obtener_registros():
-            datos = registro.obtener_todos_campos()
-            
-            # Determinar qué campos limpiar
-            campos_a_limpiar = campos if campos else datos.keys()
-            
-            for campo in campos_a_limpiar:
-                if campo in datos:
-                    valor = datos[campo]
-                    if valor is None or valor == '' or valor == 'NULL':
-                        registro.establecer_campo(campo, valor_reemplazo)
-                        reemplazos += 1
+        # Determinar qué campos limpiar (None = todos)
+        campos_a_limpiar = set(campos) if campos else None
+        
+        for registro in self._dataset.iterar_registros():
+            # Recorrer los pares sin copiar los datos del registro (cambiar el
+            # valor de un campo existente no altera la vista)
+            for campo, valor in registro.obtener_items():
+                if campos_a_limpiar is not None and campo not in campos_a_limpiar:
+                    continue
+                if es_valor_vacio(valor):
+                    registro.establecer_campo(campo, valor_reemplazo)
+                    reemplazos += 1
         
         if reemplazos > 0:
+            self._dataset.invalidar_cache()
             print(f"✓ Se reemplazaron {reemplazos} valores nulos")
         
         return reemplazos
@@ -137,30 +173,29 @@ class Limpiador:
         """
         normalizados = 0
         
-        for registro in self._dataset.obtener_registros():
-            datos = registro.obtener_todos_campos()
-            
-            # Determinar qué campos normalizar
-            campos_a_normalizar = campos if campos else datos.keys()
-            
-            for campo in campos_a_normalizar:
-                if campo in datos:
-                    valor = datos[campo]
-                    if isinstance(valor, str):
-                        # Eliminar espacios extra
-                        valor_limpio = ' '.join(valor.split())
-                        
-                        # Convertir a mayúsculas o minúsculas
-                        if mayusculas:
-                            valor_limpio = valor_limpio.upper()
-                        else:
-                            valor_limpio = valor_limpio.lower()
-                        
-                        if valor != valor_limpio:
-                            registro.establecer_campo(campo, valor_limpio)
-                            normalizados += 1
+        # Determinar qué campos normalizar (None = todos)
+        campos_a_normalizar = set(campos) if campos else None
+        
+        for registro in self._dataset.iterar_registros():
+            for campo, valor in registro.obtener_items():
+                if campos_a_normalizar is not None and campo not in campos_a_normalizar:
+                    continue
+                if isinstance(valor, str):
+                    # Eliminar espacios extra
+                    valor_limpio = ' '.join(valor.split())
+                    
+                    # Convertir a mayúsculas o minúsculas
+                    if mayusculas:
+                        valor_limpio = valor_limpio.upper()
+                    else:
+                        valor_limpio = valor_limpio.lower()
+                    
+                    if valor != valor_limpio:
+                        registro.establecer_campo(campo, valor_limpio)
+                        normalizados += 1
         
         if normalizados > 0:
+            self._dataset.invalidar_cache()
             print(f"✓ Se normalizaron {normalizados} valores de texto")
         
         return normalizados
@@ -181,16 +216,20 @@ class Limpiador:
             'errores_por_campo': {}
         }
         
+        # Todas las columnas en un solo recorrido de los registros
+        columnas = self._dataset.obtener_columnas(campos)
+        
         for campo in campos:
             errores = 0
-            for registro in self._dataset.obtener_registros():
-                valor = registro.obtener_campo(campo)
+            # Cada valor distinto se intenta convertir una sola vez
+            frecuencias = Counter(columnas[campo])
+            for valor, cantidad in frecuencias.items():
                 if valor is not None and valor != '':
                     try:
                         # Intentar convertir a float
                         float(valor)
                     except ValueError:
-                        errores += 1
+                        errores += cantidad
             
             resultado['errores_por_campo'][campo] = errores
         
@@ -200,10 +239,9 @@ class Limpiador:
         """
         Ejecuta un proceso completo de limpieza de datos.
         
-        Realiza las siguientes operaciones:
+        Realiza las siguientes operaciones en un solo recorrido del dataset:
         1. Elimina registros duplicados
         2. Elimina registros completamente vacíos
-        3. Normaliza campos de texto
         
         Returns:
             Diccionario con estadísticas de la limpieza
@@ -212,8 +250,29 @@ class Limpiador:
         print("INICIANDO LIMPIEZA DE DATOS")
         print("="*50)
         
-        duplicados = self.eliminar_duplicados()
-        vacios = self.eliminar_registros_vacios()
+        registros_unicos = []
+        registros_finales = []
+        vistos = set()
+        duplicados = 0
+        vacios = 0
+        
+        for registro in self._dataset.iterar_registros():
+            if self._es_duplicado(registro, vistos, registros_unicos):
+                duplicados += 1
+            elif self._es_vacio(registro):
+                vacios += 1
+            else:
+                registros_finales.append(registro)
+        
+        # Reconstruir el dataset una sola vez
+        if duplicados > 0 or vacios > 0:
+            self._dataset.limpiar()
+            self._dataset.agregar_registros(registros_finales)
+        
+        if duplicados > 0:
+            print(f"✓ Se eliminaron {duplicados} registros duplicados")
+        if vacios > 0:
+            print(f"✓ Se eliminaron {vacios} registros vacíos")
         
         print(f"\n✓ Limpieza completada")
         print(f"  - Registros duplicados eliminados: {duplicados}")
@@ -245,11 +304,13 @@ class Limpiador:
             'porcentaje_completitud': {}
         }
         
+        # Todas las columnas en un solo recorrido de los registros
+        columnas = self._dataset.obtener_columnas(campos)
+        
         for campo in campos:
             nulos = 0
-            for registro in self._dataset.obtener_registros():
-                valor = registro.obtener_campo(campo)
-                if valor is None or valor == '' or valor == 'NULL':
+            for valor in columnas[campo]:
+                if es_valor_vacio(valor):
                     nulos += 1
             
             reporte['campos_con_nulos'][campo] = nulos
@@ -3,15 +3,12 @@ Módulo: transformador.py
 Descripción: Clase para transformar y filtrar datos del dataset
 """
 
-import sys
-import os
+from itertools import compress
 from typing import Callable, Any, Dict
 
-# Agregar el directorio padre al path para importaciones
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-
-from src.modelos.dataset import Dataset
-from src.modelos.registro import Registro
+from ..modelos.dataset import Dataset
+from ..modelos.registro import Registro
+from ..utilidades.validadores import Validador
 
 
 class Transformador:
@@ -64,17 +61,16 @@ class Transformador:
         Returns:
             Nuevo dataset con los registros filtrados
         """
-        def condicion(registro: Registro) -> bool:
-            valor = registro.obtener_campo(nombre_campo)
-            if valor is None:
-                return False
-            try:
-                valor_num = float(valor)
-                return minimo <= valor_num <= maximo
-            except ValueError:
-                return False
+        # Convertir la columna completa de una vez y seleccionar con una máscara
+        # (los valores nulos o no numéricos quedan fuera)
+        valores = self._dataset.obtener_columnas([nombre_campo])[nombre_campo]
+        mascara = [
+            numero is not None and minimo <= numero <= maximo
+            for numero in Validador.convertir_numeros(valores)
+        ]
         
-        dataset_filtrado = self._dataset.filtrar(condicion)
+        dataset_filtrado = Dataset(f"{self._dataset.obtener_nombre()}_filtrado")
+        dataset_filtrado.agregar_registros(compress(self._dataset.iterar_registros(), mascara))
         print(f"✓ Filtrado por rango: {dataset_filtrado.cantidad_registros()} registros")
         return dataset_filtrado
     
@@ -113,9 +109,10 @@ class Transformador:
             nombre_nuevo_campo: Nombre del campo a crear
             funcion_calculo: Función que calcula el valor del nuevo campo
         """
-        for registro in self._dataset.obtener_registros():
+        for registro in self._dataset.iterar_registros():
             valor_calculado = funcion_calculo(registro)
             registro.establecer_campo(nombre_nuevo_campo, valor_calculado)
+        self._dataset.invalidar_cache()
         
         print(f"✓ Campo calculado '{nombre_nuevo_campo}' agregado a todos los registros")
     
@@ -129,12 +126,18 @@ class Transformador:
         Returns:
             Diccionario donde las claves son valores únicos y los valores son Datasets
         """
-        grupos = {}
-        valores_unicos = self._dataset.obtener_valores_unicos(nombre_campo)
+        # Repartir los registros en un solo recorrido (sin filtrar una vez por valor)
+        registros_por_valor = {}
+        for registro in self._dataset.iterar_registros():
+            valor = registro.obtener_campo(nombre_campo)
+            if valor is not None:
+                registros_por_valor.setdefault(valor, []).append(registro)
         
-        for valor in valores_unicos:
-            # Filtrar registros para este valor
-            dataset_grupo = self.filtrar_por_campo(nombre_campo, valor)
+        grupos = {}
+        nombre_grupo = f"{self._dataset.obtener_nombre()}_filtrado"
+        for valor, registros in registros_por_valor.items():
+            dataset_grupo = Dataset(nombre_grupo)
+            dataset_grupo.agregar_registros(registros)
             grupos[valor] = dataset_grupo
         
         print(f"✓ Datos agrupados en {len(grupos)} grupos por '{nombre_campo}'")
@@ -152,21 +155,22 @@ class Transformador:
         Returns:
             Diccionario con los totales por grupo
         """
-        grupos = self.agrupar_por_campo(campo_agrupacion)
+        # Una sola pasada sobre las dos columnas, en lugar de filtrar el
+        # dataset completo una vez por cada grupo
+        columnas = self._dataset.obtener_columnas([campo_agrupacion, campo_suma])
+        numeros = Validador.convertir_numeros(columnas[campo_suma])
         totales = {}
         
-        for valor, dataset_grupo in grupos.items():
-            total = 0
-            for registro in dataset_grupo.obtener_registros():
-                valor_campo = registro.obtener_campo(campo_suma)
-                if valor_campo is not None:
-                    try:
-                        total += float(valor_campo)
-                    except ValueError:
-                        pass
-            totales[valor] = round(total, 2)
-        
-        return totales
+        for grupo, numero in zip(columnas[campo_agrupacion], numeros):
+            if grupo is None:
+                continue
+            if numero is None:
+                # Valor nulo o no numérico: el grupo existe aunque no sume
+                totales.setdefault(grupo, 0)
+            else:
+                totales[grupo] = totales.get(grupo, 0) + numero
+        
+        return {grupo: round(total, 2) for grupo, total in totales.items()}
     
     def seleccionar_campos(self, campos: list) -> Dataset:
         """
@@ -180,7 +184,7 @@ class Transformador:
         """
         dataset_nuevo = Dataset(f"{self._dataset.obtener_nombre()}_proyectado")
         
-        for registro in self._dataset.obtener_registros():
+        for registro in self._dataset.iterar_registros():
             datos_filtrados = {}
             for campo in campos:
                 if registro.tiene_campo(campo):
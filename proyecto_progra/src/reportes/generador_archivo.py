@@ -3,16 +3,20 @@ Módulo: generador_archivo.py
 Descripción: Implementa generador de reportes para archivos (TXT, JSON, XML)
 """
 
-import sys
-import os
 import json
 from pathlib import Path
 from datetime import datetime
 
-# Agregar el directorio padre al path para importaciones
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from .generador_base import GeneradorReporteBase
 
-from src.reportes.generador_base import GeneradorReporteBase
+# Tabla de reemplazos para escapar XML en una sola pasada
+_ESCAPES_XML = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+    '"': '&quot;',
+    "'": '&apos;',
+})
 
 
 class GeneradorReporteArchivo(GeneradorReporteBase):
@@ -77,27 +81,32 @@ class GeneradorReporteArchivo(GeneradorReporteBase):
         """
         Genera reporte en formato TXT.
         """
+        # Los fragmentos se acumulan en una lista y se escriben de una sola vez
+        partes = []
+        
+        # Encabezado
+        partes.append(self._crear_linea_separadora(60, "=") + "\n")
+        partes.append(f"{self._titulo.upper():^60}\n")
+        partes.append(f"{'Generado: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'):^60}\n")
+        partes.append(self._crear_linea_separadora(60, "=") + "\n\n")
+        
+        # Contenido
+        if not self._datos:
+            partes.append("No hay datos para mostrar\n")
+        else:
+            self._escribir_datos_txt(partes, self._datos)
+        
+        partes.append("\n" + self._crear_linea_separadora(60, "=") + "\n")
+        
         with open(self._ruta_salida, 'w', encoding='utf-8') as archivo:
-            # Encabezado
-            archivo.write(self._crear_linea_separadora(60, "=") + "\n")
-            archivo.write(f"{self._titulo.upper():^60}\n")
-            archivo.write(f"{'Generado: ' + datetime.now().strftime('%Y-%m-%d %H:%M:%S'):^60}\n")
-            archivo.write(self._crear_linea_separadora(60, "=") + "\n\n")
-            
-            # Contenido
-            if not self._datos:
-                archivo.write("No hay datos para mostrar\n")
-            else:
-                self._escribir_datos_txt(archivo, self._datos)
-            
-            archivo.write("\n" + self._crear_linea_separadora(60, "=") + "\n")
+            archivo.write(''.join(partes))
     
-    def _escribir_datos_txt(self, archivo, datos: dict, nivel: int = 0) -> None:
+    def _escribir_datos_txt(self, partes: list, datos: dict, nivel: int = 0) -> None:
         """
-        Escribe datos en formato texto de forma recursiva.
+        Agrega los datos en formato texto de forma recursiva.
         
         Args:
-            archivo: Handle del archivo
+            partes: Lista donde se acumulan los fragmentos de texto
             datos: Datos a escribir
             nivel: Nivel de indentación
         """
@@ -105,11 +114,11 @@ class GeneradorReporteArchivo(GeneradorReporteBase):
         
         for clave, valor in datos.items():
             if isinstance(valor, dict):
-                archivo.write(f"\n{indentacion}{clave.upper().replace('_', ' ')}:\n")
-                self._escribir_datos_txt(archivo, valor, nivel + 1)
+                partes.append(f"\n{indentacion}{clave.upper().replace('_', ' ')}:\n")
+                self._escribir_datos_txt(partes, valor, nivel + 1)
             elif isinstance(valor, list):
-                archivo.write(f"\n{indentacion}{clave.upper().replace('_', ' ')}:\n")
-                self._escribir_lista_txt(archivo, valor, nivel + 1)
+                partes.append(f"\n{indentacion}{clave.upper().replace('_', ' ')}:\n")
+                self._escribir_lista_txt(partes, valor, nivel + 1)
             else:
                 clave_formateada = clave.replace('_', ' ').title()
                 
@@ -118,14 +127,14 @@ class GeneradorReporteArchivo(GeneradorReporteBase):
                 else:
                     valor_formateado = str(valor)
                 
-                archivo.write(f"{indentacion}  • {clave_formateada}: {valor_formateado}\n")
+                partes.append(f"{indentacion}  • {clave_formateada}: {valor_formateado}\n")
     
-    def _escribir_lista_txt(self, archivo, lista: list, nivel: int = 0) -> None:
+    def _escribir_lista_txt(self, partes: list, lista: list, nivel: int = 0) -> None:
         """
-        Escribe una lista en formato texto.
+        Agrega una lista en formato texto.
         
         Args:
-            archivo: Handle del archivo
+            partes: Lista donde se acumulan los fragmentos de texto
             lista: Lista a escribir
             nivel: Nivel de indentación
         """
@@ -138,12 +147,12 @@ class GeneradorReporteArchivo(GeneradorReporteBase):
                     valor_formateado = self._formatear_numero(valor)
                 else:
                     valor_formateado = str(valor)
-                archivo.write(f"{indentacion}  {i}. {clave}: {valor_formateado}\n")
+                partes.append(f"{indentacion}  {i}. {clave}: {valor_formateado}\n")
             elif isinstance(elemento, dict):
-                archivo.write(f"{indentacion}  {i}.\n")
-                self._escribir_datos_txt(archivo, elemento, nivel + 1)
+                partes.append(f"{indentacion}  {i}.\n")
+                self._escribir_datos_txt(partes, elemento, nivel + 1)
             else:
-                archivo.write(f"{indentacion}  {i}. {elemento}\n")
+                partes.append(f"{indentacion}  {i}. {elemento}\n")
     
     def _generar_json(self) -> None:
         """
@@ -155,34 +164,42 @@ class GeneradorReporteArchivo(GeneradorReporteBase):
             'datos': self._datos
         }
         
+        # Con indent, json.dump escribe cada fragmento por separado; dumps arma
+        # el texto completo y se escribe de una sola vez (mismo contenido)
+        contenido = json.dumps(reporte_completo, indent=2, ensure_ascii=False)
         with open(self._ruta_salida, 'w', encoding='utf-8') as archivo:
-            json.dump(reporte_completo, archivo, indent=2, ensure_ascii=False)
+            archivo.write(contenido)
     
     def _generar_xml(self) -> None:
         """
         Genera reporte en formato XML.
         """
+        # Los fragmentos se acumulan en una lista y se escriben de una sola vez
+        partes = []
+        
+        # Cabecera XML
+        partes.append('<?xml version="1.0" encoding="UTF-8"?>\n')
+        partes.append('<reporte>\n')
+        partes.append(f'  <titulo>{self._escapar_xml(self._titulo)}</titulo>\n')
+        partes.append(f'  <fecha_generacion>{datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</fecha_generacion>\n')
+        partes.append('  <datos>\n')
+        
+        # Contenido
+        if self._datos:
+            self._escribir_datos_xml(partes, self._datos, nivel=2)
+        
+        partes.append('  </datos>\n')
+        partes.append('</reporte>\n')
+        
         with open(self._ruta_salida, 'w', encoding='utf-8') as archivo:
-            # Cabecera XML
-            archivo.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            archivo.write('<reporte>\n')
-            archivo.write(f'  <titulo>{self._escapar_xml(self._titulo)}</titulo>\n')
-            archivo.write(f'  <fecha_generacion>{datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</fecha_generacion>\n')
-            archivo.write('  <datos>\n')
-            
-            # Contenido
-            if self._datos:
-                self._escribir_datos_xml(archivo, self._datos, nivel=2)
-            
-            archivo.write('  </datos>\n')
-            archivo.write('</reporte>\n')
+            archivo.write(''.join(partes))
     
-    def _escribir_datos_xml(self, archivo, datos: dict, nivel: int = 1) -> None:
+    def _escribir_datos_xml(self, partes: list, datos: dict, nivel: int = 1) -> None:
         """
-        Escribe datos en formato XML de forma recursiva.
+        Agrega los datos en formato XML de forma recursiva.
         
         Args:
-            archivo: Handle del archivo
+            partes: Lista donde se acumulan los fragmentos de texto
             datos: Datos a escribir
             nivel: Nivel de indentación
         """
@@ -193,23 +210,23 @@ class GeneradorReporteArchivo(GeneradorReporteBase):
             etiqueta = clave.replace(' ', '_').replace('-', '_').lower()
             
             if isinstance(valor, dict):
-                archivo.write(f"{indentacion}<{etiqueta}>\n")
-                self._escribir_datos_xml(archivo, valor, nivel + 1)
-                archivo.write(f"{indentacion}</{etiqueta}>\n")
+                partes.append(f"{indentacion}<{etiqueta}>\n")
+                self._escribir_datos_xml(partes, valor, nivel + 1)
+                partes.append(f"{indentacion}</{etiqueta}>\n")
             elif isinstance(valor, list):
-                archivo.write(f"{indentacion}<{etiqueta}>\n")
-                self._escribir_lista_xml(archivo, valor, nivel + 1)
-                archivo.write(f"{indentacion}</{etiqueta}>\n")
+                partes.append(f"{indentacion}<{etiqueta}>\n")
+                self._escribir_lista_xml(partes, valor, nivel + 1)
+                partes.append(f"{indentacion}</{etiqueta}>\n")
             else:
                 valor_escapado = self._escapar_xml(str(valor))
-                archivo.write(f"{indentacion}<{etiqueta}>{valor_escapado}</{etiqueta}>\n")
+                partes.append(f"{indentacion}<{etiqueta}>{valor_escapado}</{etiqueta}>\n")
     
-    def _escribir_lista_xml(self, archivo, lista: list, nivel: int = 1) -> None:
+    def _escribir_lista_xml(self, partes: list, lista: list, nivel: int = 1) -> None:
         """
-        Escribe una lista en formato XML.
+        Agrega una lista en formato XML.
         
         Args:
-            archivo: Handle del archivo
+            partes: Lista donde se acumulan los fragmentos de texto
             lista: Lista a escribir
             nivel: Nivel de indentación
         """
@@ -220,16 +237,16 @@ class GeneradorReporteArchivo(GeneradorReporteBase):
                 clave, valor = elemento
                 etiqueta_clave = str(clave).replace(' ', '_').replace('-', '_').lower()
                 valor_escapado = self._escapar_xml(str(valor))
-                archivo.write(f"{indentacion}<item>\n")
-                archivo.write(f"{indentacion}  <clave>{self._escapar_xml(str(clave))}</clave>\n")
-                archivo.write(f"{indentacion}  <valor>{valor_escapado}</valor>\n")
-                archivo.write(f"{indentacion}</item>\n")
+                partes.append(f"{indentacion}<item>\n")
+                partes.append(f"{indentacion}  <clave>{self._escapar_xml(str(clave))}</clave>\n")
+                partes.append(f"{indentacion}  <valor>{valor_escapado}</valor>\n")
+                partes.append(f"{indentacion}</item>\n")
             elif isinstance(elemento, dict):
-                archivo.write(f"{indentacion}<item>\n")
-                self._escribir_datos_xml(archivo, elemento, nivel + 1)
-                archivo.write(f"{indentacion}</item>\n")
+                partes.append(f"{indentacion}<item>\n")
+                self._escribir_datos_xml(partes, elemento, nivel + 1)
+                partes.append(f"{indentacion}</item>\n")
             else:
-                archivo.write(f"{indentacion}<item>{self._escapar_xml(str(elemento))}</item>\n")
+                partes.append(f"{indentacion}<item>{self._escapar_xml(str(elemento))}</item>\n")
     
     def _escapar_xml(self, texto: str) -> str:
         """
@@ -241,13 +258,7 @@ class GeneradorReporteArchivo(GeneradorReporteBase):
         Returns:
             Texto escapado
         """
-        texto = str(texto)
-        texto = texto.replace('&', '&amp;')
-        texto = texto.replace('<', '&lt;')
-        texto = texto.replace('>', '&gt;')
-        texto = texto.replace('"', '&quot;')
-        texto = texto.replace("'", '&apos;')
-        return texto
+        return str(texto).translate(_ESCAPES_XML)
     
     def obtener_ruta_salida(self) -> str:
         """
@@ -5,11 +5,6 @@ Descripción: Define la clase abstracta base para generadores de reportes
 
 from abc import ABC, abstractmethod
 from typing import Any, Dict
-import sys
-import os
-
-# Agregar el directorio padre al path para importaciones
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
 
 class GeneradorReporteBase(ABC):
@@ -3,13 +3,7 @@ Módulo: generador_consola.py
 Descripción: Implementa generador de reportes para consola
 """
 
-import sys
-import os
-
-# Agregar el directorio padre al path para importaciones
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
-
-from src.reportes.generador_base import GeneradorReporteBase
+from .generador_base import GeneradorReporteBase
 
 
 class GeneradorReporteConsola(GeneradorReporteBase):
@@ -28,6 +28,27 @@ class Formateador:
         except (ValueError, TypeError):
             return f"{simbolo}0.00"
     
+    @staticmethod
+    def formatear_monedas(valores: list, simbolo: str = "$") -> list:
+        """
+        Formatea varios valores como moneda de una sola vez.
+        
+        Equivale a llamar a formatear_moneda con cada valor, pero el caso
+        común (todos numéricos) se resuelve en una sola comprensión.
+        
+        Args:
+            valores: Valores numéricos
+            simbolo: Símbolo de moneda
+            
+        Returns:
+            Lista de strings formateados como moneda
+        """
+        try:
+            return [f"{simbolo}{valor:,.2f}" for valor in valores]
+        except (ValueError, TypeError):
+            # Algún valor no es numérico: formatear uno por uno
+            return [Formateador.formatear_moneda(valor, simbolo) for valor in valores]
+    
     @staticmethod
     def formatear_porcentaje(valor: float, decimales: int = 2) -> str:
         """
@@ -4,6 +4,24 @@ Descripción: Funciones y clases para validar datos
 """
 
 
+def _empieza_con_letra(texto: str) -> bool:
+    """
+    Indica si un texto no puede ser numérico por su primer carácter.
+    
+    float() solo acepta textos que empiezan con espacio, signo, dígito, punto
+    o con la i/n de "inf"/"nan"; cualquier otra letra inicial se descarta sin
+    provocar (y atrapar) un ValueError.
+    
+    Args:
+        texto: Texto a revisar
+        
+    Returns:
+        True si empieza con una letra distinta de i/n, False en caso contrario
+    """
+    inicial = texto[:1]
+    return inicial.isalpha() and inicial not in 'iInN'
+
+
 class Validador:
     """
     Clase con métodos estáticos para validar diferentes tipos de datos.
@@ -24,6 +42,12 @@ class Validador:
         """
         if valor is None:
             return False
+        if isinstance(valor, str):
+            # Solo dígitos decimales: siempre es numérico, sin try/except
+            if valor.isdecimal():
+                return True
+            if _empieza_con_letra(valor):
+                return False
         try:
             float(valor)
             return True
@@ -43,12 +67,61 @@ class Validador:
         """
         if valor is None:
             return False
+        # Caso común (opciones de menú): solo dígitos decimales, que int()
+        # siempre acepta; se evita construir y atrapar una excepción
+        if isinstance(valor, str) and valor.isdecimal():
+            return True
         try:
             int(valor)
             return True
         except (ValueError, TypeError):
             return False
     
+    @staticmethod
+    def convertir_numeros(valores: list) -> list:
+        """
+        Convierte una lista de valores a números de una sola vez.
+        
+        Cada valor distinto se convierte una única vez: las columnas suelen
+        repetir valores, así que los demás son una consulta a un diccionario.
+        
+        Args:
+            valores: Lista de valores a convertir
+            
+        Returns:
+            Lista alineada con la entrada: float o None si el valor no es numérico
+        """
+        conversiones = {}
+        numeros = []
+        for valor in valores:
+            try:
+                numero = conversiones[valor]
+            except KeyError:
+                numero = conversiones[valor] = Validador._convertir_numero(valor)
+            except TypeError:
+                # Valor no hashable: se convierte sin guardarlo
+                numero = Validador._convertir_numero(valor)
+            numeros.append(numero)
+        return numeros
+    
+    @staticmethod
+    def _convertir_numero(valor):
+        """
+        Convierte un valor a float.
+        
+        Args:
+            valor: Valor a convertir
+            
+        Returns:
+            El valor como float, o None si no es numérico
+        """
+        if isinstance(valor, str) and _empieza_con_letra(valor):
+            return None
+        try:
+            return float(valor)
+        except (ValueError, TypeError):
+            return None
+    
     @staticmethod
     def es_positivo(valor) -> bool:
         """